@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Client side cost of importing a CSV file with the values API or with pasteData chunks.
+
+The values path parses the file into rows and serializes them in values().update bodies of
+10000 rows, as write_data_in_range and append_data send them. The paste path splits the raw
+text in chunks at record boundaries, as SpreadsheetManager.import_file sends them. Both build
+the JSON bodies only, nothing is sent.
+
+Usage: python benchmarks/bulk_import.py [rows] [cols]
+"""
+from __future__ import print_function
+import csv
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pygsheet.importer import iter_text_chunks, paste_request
+
+VALUES_CHUNK_ROWS = 10000
+
+
+def fixture(path, n_rows, n_cols):
+    random.seed(0)
+    with io.open(path, 'w', newline='', encoding='utf-8') as output:
+        writer = csv.writer(output)
+        writer.writerow(['col{}'.format(j) for j in range(n_cols)])
+        for i in range(n_rows):
+            writer.writerow([i, round(random.random() * 1000, 4), 'label{}'.format(i % 50)] +
+                            [random.randint(0, 10 ** 6) for j in range(n_cols - 3)])
+
+
+def values_path(path):
+    n_requests, size, rows = 0, 0, []
+    with io.open(path, newline='', encoding='utf-8') as source:
+        for row in csv.reader(source):
+            rows.append(row)
+            if len(rows) == VALUES_CHUNK_ROWS:
+                size += len(json.dumps({'values': rows}))
+                n_requests, rows = n_requests + 1, []
+    if rows:
+        size += len(json.dumps({'values': rows}))
+        n_requests += 1
+    return n_requests, size
+
+
+def paste_path(path):
+    n_requests, size = 0, 0
+    for text, n_records, width in iter_text_chunks(path):
+        size += len(json.dumps({'requests': [paste_request(0, 0, 0, text)]}))
+        n_requests += 1
+    return n_requests, size
+
+
+def measure(label, function, path, n_rows):
+    start = time.time()
+    n_requests, size = function(path)
+    elapsed = time.time() - start
+    print('{:<8} {:>8.1f} ms {:>12.0f} rows/s {:>5} requests {:>8.1f} MiB sent'.format(
+        label, elapsed * 1000, n_rows / elapsed, n_requests, size / 2.0 ** 20))
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'fixture.csv')
+        fixture(path, n_rows, n_cols)
+        print('{} x {} cells, {:.1f} MiB'.format(n_rows, n_cols, os.path.getsize(path) / 2.0 ** 20))
+        measure('values', values_path, path, n_rows)
+        measure('paste', paste_path, path, n_rows)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
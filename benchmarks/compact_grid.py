@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Memory per cell of a read kept as lists of rows or as a CompactGrid.
+
+Both results are decoded from the same serialized ValueRange, as the API client
+does, and only the memory still held by the result is counted.
+
+Usage: python benchmarks/compact_grid.py [rows] [cols]
+"""
+from __future__ import print_function
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pygsheet.grid import CompactGrid
+
+
+def fixture(n_rows, n_cols):
+    random.seed(0)
+    rows = [['col{}'.format(j) for j in range(n_cols)]]
+    for i in range(n_rows):
+        row = [i, random.random() * 1000, 'label{}'.format(i % 50)] + [random.randint(0, 10 ** 6) for j in range(n_cols - 3)]
+        rows.append(row[:random.randint(n_cols - 2, n_cols)])
+    return json.dumps({'values': rows})
+
+
+def list_path(payload):
+    return json.loads(payload)['values']
+
+
+def grid_path(payload):
+    return CompactGrid.from_rows(json.loads(payload).pop('values'))
+
+
+def measure(label, function, payload, n_cells):
+    tracemalloc.start()
+    start = time.time()
+    result = function(payload)
+    elapsed = time.time() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('{:<12} {:>8.1f} ms {:>8.1f} MiB peak {:>8.1f} MiB result {:>6.1f} bytes/cell'.format(
+        label, elapsed * 1000, peak / 2.0 ** 20, retained / 2.0 ** 20, float(retained) / n_cells))
+    return result
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    payload = fixture(n_rows, n_cols)
+    n_cells = (n_rows + 1) * n_cols
+    print('{} x {} cells'.format(n_rows, n_cols))
+    measure('lists', list_path, payload, n_cells)
+    grid = measure('CompactGrid', grid_path, payload, n_cells)
+    start = time.time()
+    for row in grid:
+        pass
+    print('{:<12} {:>8.1f} ms'.format('iteration', (time.time() - start) * 1000))
+
+
+if __name__ == '__main__':
+    main()
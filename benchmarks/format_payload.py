@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Payload size and build time of range formatting requests.
+
+Compares the former per-cell UpdateCellsRequest payload with the repeatCell
+request sent by SpreadsheetManager.cell_format and text_format.
+
+Usage: python benchmarks/format_payload.py [rows] [cols]
+"""
+from __future__ import print_function
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pygsheet.pygsheet import CellFormat, TextFormat
+
+
+def per_cell_request(grid_range, user_format, n_rows, n_cols):
+    rows = [{"values": [{"userEnteredFormat": user_format} for j in range(n_cols)]} for i in range(n_rows)]
+    return {"updateCells": {"rows": rows, "range": grid_range, "fields": "userEnteredFormat"}}
+
+
+def measure(label, build):
+    seconds = min(timeit.repeat(build, number=1, repeat=3))
+    size = len(json.dumps(build(), separators=(',', ':')))
+    print('{:<28} {:>12} bytes {:>10.2f} ms'.format(label, size, seconds * 1000))
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    grid_range = {"sheetId": 0, "startRowIndex": 0, "endRowIndex": n_rows, "startColumnIndex": 0, "endColumnIndex": n_cols}
+    print('{} x {} cells'.format(n_rows, n_cols))
+    for name, style in (('cell_format', CellFormat(background='white', h_alignment='center')),
+                        ('text_format', TextFormat(color='black', size=10, bold=True))):
+        measure(name + ' per cell', lambda: per_cell_request(grid_range, style.get_format(), n_rows, n_cols))
+        measure(name + ' repeatCell', lambda: style.get_request(grid_range))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Number of requests of a report styling pass, sent format by format or planned with FormatPlanner.
+
+The pass formats a header, aligns and sizes every data cell column by column, highlights some rows
+and draws the borders of every cell, the way a script calling cell_format, text_format and
+update_borders for each cell builds them. Only the request bodies are built, nothing is sent.
+
+Usage: python benchmarks/format_planner.py [rows] [cols]
+"""
+from __future__ import print_function
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pygsheet.pygsheet import BorderFormat, CellFormat, TextFormat
+from pygsheet.ranges import GridRange
+from pygsheet.styles import FormatPlanner, StyleRegistry
+
+
+class Manager(object):
+    def get_sheets_id(self, sheet):
+        return 0
+
+
+def styling_pass(n_rows, n_cols):
+    yield ((1, 1), (1, n_cols)), CellFormat(background=(217, 217, 217), h_alignment='center')
+    yield ((1, 1), (1, n_cols)), TextFormat(color=(0, 0, 0), size=11, bold=True)
+    for j in range(1, n_cols + 1):
+        alignment = 'left' if j == 1 else 'right'
+        for i in range(2, n_rows + 1):
+            yield ((i, j), (i, j)), CellFormat(background=(255, 255, 255), h_alignment=alignment)
+            yield ((i, j), (i, j)), TextFormat(color=(0, 0, 0), size=10)
+    for i in range(2, n_rows + 1, 10):
+        yield ((i, 1), (i, n_cols)), CellFormat(background=(255, 242, 204), h_alignment='right')
+    for i in range(1, n_rows + 1):
+        for j in range(1, n_cols + 1):
+            yield ((i, j), (i, j)), BorderFormat('SOLID', 1, color=(0, 0, 0))
+
+
+def direct(n_rows, n_cols):
+    return [style.get_request(GridRange.parse(sheet_range).to_dict(0)) for sheet_range, style in styling_pass(n_rows, n_cols)]
+
+
+def planned(n_rows, n_cols):
+    planner = FormatPlanner(Manager(), StyleRegistry())
+    for sheet_range, style in styling_pass(n_rows, n_cols):
+        planner.add('Sheet1', sheet_range, style)
+    return planner.get_requests()
+
+
+def measure(label, build, n_rows, n_cols):
+    start = time.time()
+    requests = build(n_rows, n_cols)
+    elapsed = time.time() - start
+    size = len(json.dumps({'requests': requests}, separators=(',', ':')))
+    print('{:<8} {:>7} requests {:>10.1f} KiB {:>10.1f} ms'.format(label, len(requests), size / 1024.0, elapsed * 1000))
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    print('{} x {} cells'.format(n_rows, n_cols))
+    measure('direct', direct, n_rows, n_cols)
+    measure('planned', planned, n_rows, n_cols)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Conversion time and peak memory of a 500k cells read.
+
+Compares the list path of read_data_in_range, followed by the normalization every
+numeric consumer had to do, with the columnar path of read_frame. Times are the best of
+repeats runs, peak memory is traced on a separate run.
+
+Usage: python benchmarks/read_frame.py [rows] [cols] [repeats]
+"""
+from __future__ import print_function
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pygsheet.frames import rows_to_columns, to_frame
+from pygsheet.pygsheet import SpreadsheetManager
+
+
+def fixture(n_rows, n_cols):
+    random.seed(0)
+    rows = [['col{}'.format(j) for j in range(n_cols)]]
+    for i in range(n_rows):
+        row = [i, random.random() * 1000, 'label{}'.format(i % 50)] + [random.randint(0, 10 ** 6) for j in range(n_cols - 3)]
+        rows.append(row[:random.randint(n_cols - 2, n_cols)])
+    return {'values': rows}
+
+
+def list_path(response):
+    rows = SpreadsheetManager.process_values(response)
+    width = max(len(row) if isinstance(row, list) else 1 for row in rows)
+    rows = [row if isinstance(row, list) else [row] for row in rows[1:]]
+    columns = [[] for j in range(width)]
+    for row in rows:
+        for j in range(width):
+            value = row[j] if j < len(row) else None
+            columns[j].append(float(value) if isinstance(value, (int, float)) else value)
+    return columns
+
+
+def frame_path(response):
+    names, columns = rows_to_columns(response['values'])
+    return to_frame(names, columns, 'numpy')
+
+
+def measure(label, function, response, repeats):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        function(response)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    result = function(response)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('{:<12} {:>8.1f} ms best of {} {:>8.1f} MiB peak {:>8.1f} MiB result'.format(
+        label, min(times) * 1000, repeats, peak / 2.0 ** 20, retained / 2.0 ** 20))
+    return result
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 7
+    response = fixture(n_rows, n_cols)
+    print('{} x {} cells'.format(n_rows, n_cols))
+    measure('list path', list_path, response, repeats)
+    measure('read_frame', frame_path, response, repeats)
+
+
+if __name__ == '__main__':
+    main()
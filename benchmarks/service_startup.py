@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Service construction time with and without the persisted discovery documents.
+
+Compares discovery.build fetching the document from the network, building from
+the local copy persisted by pygsheet.session and building from the document
+memoized in the process.
+
+Usage: python benchmarks/service_startup.py [repeat]
+"""
+from __future__ import print_function
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import httplib2
+from apiclient import discovery
+
+from pygsheet import session
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cache_dir = tempfile.mkdtemp()
+    try:
+        for api, version in sorted(session.DISCOVERY_URLS):
+            url = session.DISCOVERY_URLS[(api, version)]
+            network = min(timeit.repeat(lambda: discovery.build(api, version, http=httplib2.Http(), discoveryServiceUrl=url, cache_discovery=False), number=1, repeat=repeat))
+            session.load_discovery_document(api, version, cache_dir)
+            local = min(timeit.repeat(lambda: session.build_service(api, version, http=httplib2.Http(), cache_dir=cache_dir, memoize=False), number=1, repeat=repeat))
+            session.build_service(api, version, http=httplib2.Http(), cache_dir=cache_dir)
+            memoized = min(timeit.repeat(lambda: session.build_service(api, version, http=httplib2.Http(), cache_dir=cache_dir), number=1, repeat=repeat))
+            print('{} {}: network {:.1f} ms, local document {:.1f} ms, memoized document {:.3f} ms'.format(
+                api, version, network * 1000, local * 1000, memoized * 1000))
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncManager:
+    """Base class for awaitable wrappers of the synchronous managers.
+    Every call runs on a bounded pool of worker threads, which check out keep-alive connections from the
+    session pool, so independent calls gathered together take about as long as the slowest one.
+    """
+    def __init__(self, manager, concurrency=10):
+        """Class parameters
+        Args:
+            manager (SpreadsheetManager or DriveManager): Synchronous manager which builds and executes the requests.
+            concurrency (int, optional): Maximum number of requests running at the same time.
+        """
+        self.manager = manager
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def run(self, function, *args, **kwargs):
+        """This function awaits a blocking function in the worker pool
+        Args:
+            function (callable): Function to run.
+        Returns:
+            Result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    async def execute(self, request):
+        """This function awaits a request built from the manager service"""
+        return await self.run(self.manager.execute, request)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+class AsyncSpreadsheetManager(AsyncManager):
+    """Awaitable counterpart of SpreadsheetManager
+    """
+    def __init__(self, app_name=None, spreadsheetId=None, cred_path=None, concurrency=10, manager=None, **kwargs):
+        """Class parameters
+        Args:
+            app_name (str): Just a name for class instance.
+            spreadsheetId (str, optional): id of spreadsheet, a new one is created by default.
+            cred_path (str, optional): Directory of the credentials.
+            concurrency (int, optional): Maximum number of requests running at the same time.
+            manager (SpreadsheetManager, optional): An already built manager, the other arguments are ignored.
+            kwargs: Other arguments of SpreadsheetManager, lazy is True by default so that nothing blocks the event loop
+                here, the service and the spreadsheet are set up by the first call, in the executor.
+        """
+        if manager is None:
+            from pygsheet.pygsheet import SpreadsheetManager
+            kwargs.setdefault('lazy', True)
+            manager = SpreadsheetManager(app_name, spreadsheetId=spreadsheetId, cred_path=cred_path, **kwargs)
+        super(AsyncSpreadsheetManager, self).__init__(manager, concurrency)
+
+    async def read_data_in_range(self, sheet, sheet_range=None, omit_empty=False):
+        return await self.run(self.manager.read_data_in_range, sheet, sheet_range, omit_empty=omit_empty)
+
+    async def read_ranges(self, ranges, omit_empty=False, spreadsheet_id=None):
+        return await self.run(self.manager.read_ranges, ranges, omit_empty=omit_empty, spreadsheet_id=spreadsheet_id)
+
+    async def write_data_in_range(self, data, sheet, sheet_range=None, value_input='USER_ENTERED'):
+        return await self.run(self.manager.write_data_in_range, data, sheet, sheet_range, value_input=value_input)
+
+    async def write_ranges(self, ranges, value_input='USER_ENTERED'):
+        return await self.run(self.manager.write_ranges, ranges, value_input=value_input)
+
+    async def append_data(self, data, sheet, value_input='USER_ENTERED'):
+        return await self.run(self.manager.append_data, data, sheet, value_input=value_input)
+
+    async def append_rows(self, rows, sheet, chunk_rows=1000, max_in_flight=2, value_input='USER_ENTERED'):
+        return await self.run(self.manager.append_rows, rows, sheet, chunk_rows=chunk_rows, max_in_flight=max_in_flight, value_input=value_input)
+
+    async def delete_data(self, sheet, sheet_range=None):
+        return await self.run(self.manager.delete_data, sheet, sheet_range)
+
+    async def update_borders(self, sheet, style, width, **kwargs):
+        return await self.run(self.manager.update_borders, sheet, style, width, **kwargs)
+
+    async def cell_format(self, sheet, **kwargs):
+        return await self.run(self.manager.cell_format, sheet, **kwargs)
+
+    async def text_format(self, sheet, **kwargs):
+        return await self.run(self.manager.text_format, sheet, **kwargs)
+
+    async def create_sheet(self, title, **kwargs):
+        return await self.run(self.manager.create_sheet, title, **kwargs)
+
+    async def delete_sheet(self, sheet):
+        return await self.run(self.manager.delete_sheet, sheet)
+
+    async def get_sheets_id(self, sheet=None, refresh=False):
+        return await self.run(self.manager.get_sheets_id, sheet, refresh=refresh)
+
+    async def execute_pipeline(self, **kwargs):
+        return await self.run(self.manager.execute_pipeline, **kwargs)
+
+
+class AsyncDriveManager(AsyncManager):
+    """Awaitable counterpart of DriveManager
+    """
+    def __init__(self, secret_file='client_secret.json', app_name='Drive API Python Quickstart', cred_path=None, concurrency=10, manager=None):
+        """Class parameters
+        Args:
+            secret_file (str, optional): Client secret file.
+            app_name (str, optional): Just a name for class instance.
+            cred_path (str, optional): Directory of the credentials.
+            concurrency (int, optional): Maximum number of requests running at the same time.
+            manager (DriveManager, optional): An already built manager, the other arguments are ignored.
+        """
+        if manager is None:
+            from pygsheet.drive_manager import DriveManager
+            manager = DriveManager(secret_file=secret_file, app_name=app_name, cred_path=cred_path)
+        super(AsyncDriveManager, self).__init__(manager, concurrency)
+
+    async def share_file(self, file_id, domain=None, user_list=None):
+        return await self.run(self.manager.share_file, file_id, domain=domain, user_list=user_list)
+
+    async def create_folder(self, name, parents=None, team_drives=True):
+        return await self.run(self.manager.create_folder, name, parents=parents, team_drives=team_drives)
+
+    async def move_file_to_folder(self, file_id, folder_id, remove_parents=False, team_drives=True):
+        return await self.run(self.manager.move_file_to_folder, file_id, folder_id, remove_parents=remove_parents, team_drives=team_drives)
+
+    async def copy_file(self, file_id, new_name=None, new_folder=None, body=None, team_drives=True):
+        return await self.run(self.manager.copy_file, file_id, new_name=new_name, new_folder=new_folder, body=body, team_drives=team_drives)
+
+    async def copy_many(self, file_ids, new_folder=None, **kwargs):
+        return await self.run(self.manager.copy_many, file_ids, new_folder=new_folder, **kwargs)
+
+    async def move_many(self, file_ids, folder_id, remove_parents=False, team_drives=True):
+        return await self.run(self.manager.move_many, file_ids, folder_id, remove_parents=remove_parents, team_drives=team_drives)
+
+    async def share_many(self, file_ids, domain=None, user_list=None, **kwargs):
+        return await self.run(self.manager.share_many, file_ids, domain=domain, user_list=user_list, **kwargs)
+
+    async def upload_file(self, filename, mtype=None, folder=None, team_drives=True, **kwargs):
+        return await self.run(self.manager.upload_file, filename, mtype, folder=folder, team_drives=team_drives, **kwargs)
+
+    async def upload_many(self, files, folder=None, max_workers=4, **kwargs):
+        return await self.run(self.manager.upload_many, files, folder=folder, max_workers=max_workers, **kwargs)
+
+    async def list_files(self, team_drive_id=None, team_drives=True, q=None):
+        return await self.run(self.manager.list_files, team_drive_id=team_drive_id, team_drives=team_drives, q=q)
+
+    async def list_team_drives(self):
+        return await self.run(self.manager.list_team_drives)
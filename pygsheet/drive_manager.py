@@ -1,23 +1,91 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
-import httplib2
+
+import mimetypes
 import os
+import random
+import time
+
+from pygsheet.session import Session
+
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+MAX_BATCH_SIZE = 100
+MIME_TYPES = {
+    'ppt': 'application/vnd.mspowerpoint',
+    'pdf': 'application/pdf',
+    'gif': 'image/gif',
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'xls': 'application/vnd.ms-excel',
+    'pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+
+def get_mime_type(filename, mtype=None):
+    """Gets the MIME type of a file.
+
+    Args:
+        filename (str): Path of the file.
+        mtype (str, optional): Extension key of MIME_TYPES or a MIME type, guessed from the file name by default.
+
+    Returns:
+        str: MIME type, application/octet-stream when it is unknown.
+    """
+    if mtype and '/' in mtype:
+        return mtype
+    if mtype:
+        return MIME_TYPES.get(mtype.lower()) or mimetypes.guess_type('file.' + mtype)[0] or 'application/octet-stream'
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+
+class CountingHttp:
+    """Connection wrapper which counts the requests sent through it."""
+
+    def __init__(self, http, counter):
+        self.http = http
+        self.counter = counter
+
+    def request(self, *args, **kwargs):
+        self.counter.requests += 1
+        return self.http.request(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+class UploadChunk:
+    """Adapter which lets the scheduler throttle and retry each chunk of a resumable upload.
+
+    After a failed chunk the upload request asks the server for the bytes it already has,
+    so a retry continues from there. Every request sent, the one opening the upload session
+    and those asking for the uploaded bytes included, is counted in requests.
+    """
+    method = 'PUT'
+
+    def __init__(self, request):
+        self.request = request
+        self.uri = request.uri
+        self.requests = 0
+
+    def execute(self, http=None):
+        return self.request.next_chunk(http=CountingHttp(http or self.request.http, self))
 
-from apiclient import discovery
-from apiclient.http import MediaFileUpload
-from oauth2client import client
-from oauth2client import tools
-from oauth2client.file import Storage
 
 class DriveManager():
-    def __init__(self, secret_file='client_secret.json', app_name='Drive API Python Quickstart', cred_path=None):
+    def __init__(self, secret_file='client_secret.json', app_name='Drive API Python Quickstart', cred_path=None, scheduler=None, session=None):
         self.secret_file = secret_file
         self.app_name = app_name
+        self.session = session or Session(app_name, cred_path=cred_path, secret_file=secret_file, scheduler=scheduler)
+        self.scheduler = scheduler or self.session.scheduler
         self.service = self.get_service(cred_path=cred_path)
+        self.uploads = {}
 
 
-    def get_credentials(self, cred_path):
-        """Gets valid user credentials from storage.
+    def get_credentials(self, cred_path=None):
+        """Gets valid user credentials from the session.
 
         If nothing has been stored, or if the stored credentials are invalid,
         the OAuth2 flow is completed to obtain the new credentials.
@@ -25,70 +93,95 @@ class DriveManager():
         Returns:
             Credentials, the obtained credential.
         """
-        if not cred_path:
-            home_dir = os.path.expanduser('~')
-            credential_dir = os.path.join(home_dir, '.credentials')
-            if not os.path.exists(credential_dir):
-                try:
-                    os.system("sudo mkdir {}".format(credential_dir))
-                except:
-                    os.umask(0)
-                    os.makedirs(credential_dir, mode=0o777)
-        else:
-            credential_dir = cred_path
-        credential_path = os.path.join(credential_dir,
-                                       'python-quickstart.json')
-
-        store = Storage(credential_path)
-        credentials = store.get()
-        if not credentials or credentials.invalid:
-            flow = client.flow_from_clientsecrets(self.secret_file, scope=['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive'])
-            flow.user_agent = self.app_name
-            try:
-                import argparse
-                flags = argparse.ArgumentParser(parents=[tools.argparser], conflict_handler='resolve').parse_args()
-            except ImportError:
-                flags = None
-            try:
-                credentials = tools.run_flow(flow, store, flags)
-            except: # Needed only for compatibility with Python 2.6
-                try:
-                    credentials = tools.run_flow(flow, store)
-                except:
-                    credentials = tools.run(flow, store)
-            print('Storing credentials to ' + credential_path)
-        return credentials
+        return self.session.get_credentials()
 
     def get_service(self, cred_path=None):
-        credentials = self.get_credentials(cred_path=cred_path)
-        http = credentials.authorize(httplib2.Http())
-        return discovery.build('drive', 'v3', http=http)
+        return self.session.get_service('drive', 'v3')
+
+    def execute(self, request, idempotent=None):
+        """Executes an API request or batch through the scheduler, on a connection checked out of the session pool.
+
+        Args:
+            request: API request or HTTP batch.
+            idempotent (bool, optional): True if the request can be retried after server errors, inferred from its HTTP method by default.
+
+        Returns:
+            The deserialized response.
+        """
+        with self.session.connection() as http:
+            return self.scheduler.execute(request, http=http, idempotent=idempotent)
 
     def share_file(self, file_id, domain=None, user_list=None):
+        """Shares a file with users as writers and with a domain as commenters, see share_many.
+
+        Returns:
+            list: A result dict for every permission.
+        """
+        return self.share_many([file_id], domain=domain, user_list=user_list)
+
+    def execute_many(self, requests, batch_size=MAX_BATCH_SIZE):
+        """Executes requests packed in HTTP batches of at most batch_size requests.
+
+        Every batch goes through the scheduler and is charged one quota token per request. Requests which
+        fail with a transient error inside a batch are sent again in a later batch, with the backoff and
+        retry limit of the scheduler. Requests which are not idempotent are only sent again after quota errors.
+
+        Args:
+            requests (list): API requests.
+            batch_size (int, optional): Maximum number of requests of a batch, 100 is the Drive limit.
+
+        Returns:
+            list: A (response, error) tuple for every request, in order.
+        """
+        results = [(None, None)] * len(requests)
+
         def callback(request_id, response, exception):
-            if exception:
-                # Handle error
-                print(exception)
-            else:
-                print("Permission Id: %s" % response.get('id'))
-
-        batch = self.service.new_batch_http_request(callback=callback)
-
-        if user_list:
-            for email in user_list:
-                batch.add(self.service.permissions().create(
-                    fileId=file_id,
-                    body= {'type': 'user', 'role': 'writer', 'emailAddress': email},
-                    fields='id',
-                ))
-            if domain:
-                batch.add(self.service.permissions().create(
-                    fileId=file_id,
-                    body={'type': 'domain', 'role': 'commenter', 'domain': domain},
-                    fields='id',
-                ))
-
-        batch.execute()
+            results[int(request_id)] = (response, exception)
+
+        pending = list(range(len(requests)))
+        attempt = 0
+        while pending:
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                batch = self.service.new_batch_http_request(callback=callback)
+                for i in chunk:
+                    batch.add(requests[i], request_id=str(i))
+                try:
+                    self.execute(batch)
+                except Exception as error:
+                    for i in chunk:
+                        results[i] = (None, error)
+            retry = [i for i in pending if results[i][1] is not None and
+                     self.scheduler.is_retryable(results[i][1], self.scheduler.retry_writes or self.scheduler.is_idempotent(requests[i]))]
+            if not retry or attempt >= self.scheduler.max_retries:
+                break
+            time.sleep(min(self.scheduler.max_backoff, self.scheduler.backoff * 2 ** attempt) * random.uniform(0.5, 1.0))
+            attempt += 1
+            pending = retry
+        return results
+
+    def share_many(self, file_ids, domain=None, user_list=None, role='writer', domain_role='commenter'):
+        """Shares several files with the same users and domain, in HTTP batches.
+
+        Args:
+            file_ids (list): Ids of the files.
+            domain (str, optional): Domain granted domain_role.
+            user_list (list, optional): Emails of the users granted role.
+            role (str, optional): Role of the users, writer by default.
+            domain_role (str, optional): Role of the domain, commenter by default.
+
+        Returns:
+            list: A dict for every permission, in order, with the 'file', the 'permission' body,
+            the 'response' and the 'error' raised, if any.
+        """
+        permissions = [{'type': 'user', 'role': role, 'emailAddress': email} for email in user_list or []]
+        if domain:
+            permissions.append({'type': 'domain', 'role': domain_role, 'domain': domain})
+        items = [(file_id, permission) for file_id in file_ids for permission in permissions]
+        requests = [self.service.permissions().create(fileId=file_id, body=permission, fields='id', supportsTeamDrives=True)
+                    for file_id, permission in items]
+        return [{'file': file_id, 'permission': permission, 'response': response, 'error': error}
+                for (file_id, permission), (response, error) in zip(items, self.execute_many(requests))]
 
     def update_sharing(self):
         pass
@@ -102,107 +195,248 @@ class DriveManager():
             if not isinstance(parents, list):
                 parents = [parents]
             file_metadata['parents'] = parents
-        return self.service.files().create(body=file_metadata, supportsTeamDrives=team_drives).execute()
+        return self.execute(self.service.files().create(body=file_metadata, supportsTeamDrives=team_drives))
 
     def move_file_to_folder(self, file_id, folder_id, remove_parents=False, team_drives=True):
 
         if remove_parents:
-            file = self.service.files().get(fileId=file_id,
-                                         fields='parents').execute()
+            file = self.execute(self.service.files().get(fileId=file_id,
+                                         fields='parents'))
             previous_parents = ",".join(file.get('parents'))
-            file = self.service.files().update(fileId=file_id,
+            file = self.execute(self.service.files().update(fileId=file_id,
                                             addParents=folder_id,
                                             removeParents=previous_parents,
                                             fields='id, parents',
-                                            supportsTeamDrives=team_drives).execute()
+                                            supportsTeamDrives=team_drives))
         else:
-            self.service.files().update(fileId=file_id,
+            self.execute(self.service.files().update(fileId=file_id,
                                             addParents=folder_id,
                                             fields='id, parents',
-                                            supportsTeamDrives=team_drives).execute()
+                                            supportsTeamDrives=team_drives))
 
     def copy_file(self, file_id, new_name=None, new_folder=None, body=None, team_drives=True):
-        response = None
+        body = dict(body or {})
         if new_name:
-            if body:
-                body['name'] = new_name
-            else:
-                body = {'name': new_name}
-            response = self.service.files().copy(fileId=file_id, body=body, supportsTeamDrives=team_drives).execute()
-        else:
-            if body:
-                response = self.service.files().copy(fileId=file_id, body=body, supportsTeamDrives=team_drives).execute()
-            else:
-                response = self.service.files().copy(fileId=file_id, supportsTeamDrives=team_drives).execute()
+            body['name'] = new_name
         if new_folder:
-            self.move_file_to_folder(response['id'], new_folder, remove_parents=True)
-        return response
-
-    def upload_file(self, filename, mtype, folder=None, team_drives=True):
-        mimes= {
-                'ppt': 'application/vnd.mspowerpoint',
-                'pdf': 'application/pdf',
-                'gif': 'image/gif',
-                'png': 'image/png',
-                'jpeg': 'image/jpeg',
-                'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                'xls': 'application/vnd.ms-excel',
-                'pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-                'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-            }
+            body['parents'] = [new_folder]
+        return self.execute(self.service.files().copy(fileId=file_id, body=body, supportsTeamDrives=team_drives))
 
-        file_metadata = {
-            'title': filename,
-            'mimeType': mimes[mtype],
-            'name': filename
-        }
-        if folder:
-            file_metadata['parents'] = [{'id': folder}]
-
-        file = MediaFileUpload(filename, mimetype=mimes[mtype])
-        response = self.service.files().create(body=file_metadata,
-                                     media_body=file,
-                                     fields='id',
-                                     supportsTeamDrives=team_drives).execute()
-        return response
-
-    def list_files(self, team_drive_id = None, team_drives=True, ):
-        files = []
-        corp ='teamDrive' if team_drives else 'user'
-        next_page = True
-        token = None
-#        while next_page:
-        if team_drives:
-            if token:
-                response = self.service.files().list(corpora= corp, supportsTeamDrives=team_drives, includeTeamDriveItems=team_drives, pageSize=1000, teamDriveId=team_drive_id).execute()
-            else:
-                response = self.service.files().list(corpora= corp, supportsTeamDrives=team_drives, includeTeamDriveItems=team_drives, pageSize=1000, teamDriveId=team_drive_id, pageToken=token).execute()
-            for file in response['files']:
-                files.append(file['id'])
-            #if response["nextPageToken"]:
-    #                    token = response["nextPageToken"]
-    #                    continue
-    #                else:
-#                break
-        else:
-            if token:
-                response = self.service.files().list(corpora= corp, supportsTeamDrives=team_drives, includeTeamDriveItems=team_drives, pageSize=1000).execute()
-            else:
-                response = self.service.files().list(corpora= corp, supportsTeamDrives=team_drives, pageSize=1000, pageToken=token).execute()
-            for file in response['files']:
-                files.append(file['id'])
-#            if response["nextPageToken"]:
-#                token = response["nextPageToken"]
-#                continue
-#            else:
-#                break
-        return files
-
-    def list_team_drives(self,):
-        team_drives = []
-        response = self.service.teamdrives().list(pageSize=100).execute()
-        for team_drive in response["teamDrives"]:
-            team_drives.append({'id':team_drive['id'], 'name': team_drive['name']})
-        return team_drives
+    def copy_many(self, file_ids, new_folder=None, names=None, body=None, team_drives=True):
+        """Copies several files in HTTP batches, each copy is created straight into new_folder.
+
+        Args:
+            file_ids (list): Ids of the files.
+            new_folder (str, optional): Id of the folder of the copies, the folder of each original by default.
+            names (list, optional): Name of each copy, in order, the original names by default.
+            body (dict, optional): Metadata of every copy.
+            team_drives (bool, optional): True if the files may be in a team drive.
+
+        Returns:
+            list: A dict for every file, in order, with its 'file' id, the 'response' and the 'error' raised, if any.
+        """
+        requests = []
+        for i, file_id in enumerate(file_ids):
+            copy_body = dict(body or {})
+            if names:
+                copy_body['name'] = names[i]
+            if new_folder:
+                copy_body['parents'] = [new_folder]
+            requests.append(self.service.files().copy(fileId=file_id, body=copy_body, supportsTeamDrives=team_drives))
+        return [{'file': file_id, 'response': response, 'error': error}
+                for file_id, (response, error) in zip(file_ids, self.execute_many(requests))]
+
+    def move_many(self, file_ids, folder_id, remove_parents=False, team_drives=True):
+        """Moves several files to a folder in HTTP batches, the current parents are read in batched GETs.
+
+        Args:
+            file_ids (list): Ids of the files.
+            folder_id (str): Id of the destination folder.
+            remove_parents (bool, optional): True if you want to remove the files from their current folders.
+            team_drives (bool, optional): True if the files may be in a team drive.
+
+        Returns:
+            list: A dict for every file, in order, with its 'file' id, the 'response' and the 'error' raised, if any.
+        """
+        results = [{'file': file_id, 'response': None, 'error': None} for file_id in file_ids]
+        parents = [None] * len(file_ids)
+        if remove_parents:
+            gets = [self.service.files().get(fileId=file_id, fields='parents', supportsTeamDrives=team_drives) for file_id in file_ids]
+            for i, (response, error) in enumerate(self.execute_many(gets)):
+                results[i]['error'] = error
+                parents[i] = ','.join(response.get('parents', [])) if response else None
+        pending = [i for i, result in enumerate(results) if result['error'] is None]
+        updates = []
+        for i in pending:
+            kwargs = {'removeParents': parents[i]} if parents[i] else {}
+            updates.append(self.service.files().update(fileId=file_ids[i], addParents=folder_id, fields='id, parents',
+                                                       supportsTeamDrives=team_drives, **kwargs))
+        for i, (response, error) in zip(pending, self.execute_many(updates)):
+            results[i]['response'], results[i]['error'] = response, error
+        return results
+
+    def upload_file(self, filename, mtype=None, folder=None, team_drives=True, chunk_size=UPLOAD_CHUNK_SIZE, progress=None, name=None, resume=True, target_mime=None):
+        """Uploads a file with a resumable upload, sending it in chunks.
 
+        Every chunk goes through the scheduler, so transient errors are retried from the last byte
+        acknowledged by the server instead of from zero. If the upload still fails, calling upload_file
+        again with the same filename and folder resumes the same upload session.
+
+        Args:
+            filename (str): Path of the file.
+            mtype (str, optional): Extension key of MIME_TYPES or a MIME type, guessed from the file name by default.
+            folder (str, optional): Id of the parent folder.
+            team_drives (bool, optional): True if the folder may be in a team drive.
+            chunk_size (int, optional): Bytes sent in each request, a multiple of 256 KiB, -1 to send the file in a single request.
+            progress (callable, optional): Called as progress(filename, uploaded_bytes, total_bytes) after every chunk.
+            name (str, optional): Name of the file in Drive, the file name by default.
+            resume (bool, optional): False if you want to discard a failed upload session of the file and start again.
+            target_mime (str, optional): Google Apps MIME type the file is converted to, like application/vnd.google-apps.spreadsheet.
+
+        Returns:
+            dict: The id of the uploaded file and the number of 'requests' sent by this call, retries included.
+        """
+        key = (filename, folder)
+        request = self.uploads.get(key) if resume else None
+        if request is None:
+            mimetype = get_mime_type(filename, mtype)
+            file_metadata = {'name': name or os.path.basename(filename), 'mimeType': target_mime or mimetype}
+            if folder:
+                file_metadata['parents'] = [folder]
+            from apiclient.http import MediaFileUpload
+            media = MediaFileUpload(filename, mimetype=mimetype, chunksize=chunk_size, resumable=True)
+            request = self.service.files().create(body=file_metadata, media_body=media, fields='id', supportsTeamDrives=team_drives)
+            self.uploads[key] = request
+        chunk = UploadChunk(request)
+        response = None
+        while response is None:
+            status, response = self.execute(chunk)
+            if progress is not None and status is not None:
+                progress(filename, status.resumable_progress, status.total_size)
+        self.uploads.pop(key, None)
+        if progress is not None:
+            size = os.path.getsize(filename)
+            progress(filename, size, size)
+        return dict(response, requests=chunk.requests)
+
+    def upload_many(self, files, folder=None, max_workers=4, team_drives=True, chunk_size=UPLOAD_CHUNK_SIZE, progress=None):
+        """Uploads several files at once on a bounded pool of workers, see upload_file.
+
+        Args:
+            files (list): File paths or (filename, mtype) tuples.
+            folder (str, optional): Id of the parent folder of every file.
+            max_workers (int, optional): Maximum number of uploads running at the same time.
+            team_drives (bool, optional): True if the folder may be in a team drive.
+            chunk_size (int, optional): Bytes sent in each request.
+            progress (callable, optional): Called as progress(filename, uploaded_bytes, total_bytes), from the worker threads.
+
+        Returns:
+            list: A dict for every file, in order, with its 'file', the 'response' and the 'error' raised, if any.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        files = [(item, None) if isinstance(item, str) else tuple(item) for item in files]
+
+        def upload(filename, mtype):
+            result = {'file': filename, 'response': None, 'error': None}
+            try:
+                result['response'] = self.upload_file(filename, mtype, folder=folder, team_drives=team_drives,
+                    chunk_size=chunk_size, progress=progress)
+            except Exception as error:
+                result['error'] = error
+            return result
 
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(upload, filename, mtype) for filename, mtype in files]
+            return [future.result() for future in futures]
+
+    def iter_pages(self, list_method, items, prefetch=True, **kwargs):
+        """Iterates over the items of every page of a list request.
+
+        The request of the next page is sent as soon as the current page arrives, so it is
+        downloaded while the caller consumes the current one and at most two pages are held.
+
+        Args:
+            list_method: Request factory, like self.service.files().list.
+            items (str): Key of the items in each page, like 'files'.
+            prefetch (bool, optional): False if you want to request each page only after the previous one is consumed.
+            **kwargs: Parameters of every request, pageToken is added after the first page.
+
+        Yields:
+            dict: Each item, as projected by the fields parameter.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        def fetch(token):
+            return self.execute(list_method(pageToken=token, **kwargs) if token else list_method(**kwargs))
+
+        future = executor.submit(fetch, None)
+        try:
+            while future is not None:
+                response = future.result()
+                token = response.get('nextPageToken')
+                future = executor.submit(fetch, token) if token and prefetch else None
+                for item in response.get(items, []):
+                    yield item
+                if token and future is None:
+                    future = executor.submit(fetch, token)
+        finally:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_files(self, q=None, fields='id', team_drive_id=None, team_drives=True, page_size=1000, prefetch=True):
+        """Iterates over every file matching a query, page by page.
+
+        Args:
+            q (str, optional): Search query evaluated by the server, like "mimeType = 'application/vnd.google-apps.spreadsheet'".
+            fields (str, optional): File fields retrieved, only the id by default.
+            team_drive_id (str, optional): Team drive to list, files of the user by default.
+            team_drives (bool, optional): True if you want to include team drive items.
+            page_size (int, optional): Files per page, up to 1000.
+            prefetch (bool, optional): True if you want to download the next page while the current one is consumed.
+
+        Yields:
+            dict: Each file with the requested fields.
+        """
+        kwargs = {'corpora': 'teamDrive' if team_drive_id else 'user', 'supportsTeamDrives': team_drives,
+                  'includeTeamDriveItems': team_drives, 'pageSize': page_size, 'fields': 'nextPageToken, files({})'.format(fields)}
+        if team_drive_id:
+            kwargs['teamDriveId'] = team_drive_id
+        if q:
+            kwargs['q'] = q
+        return self.iter_pages(self.service.files().list, 'files', prefetch, **kwargs)
+
+    def list_files(self, team_drive_id=None, team_drives=True, q=None):
+        """Lists the ids of every file, see iter_files.
+
+        Returns:
+            list: File ids.
+        """
+        return [file['id'] for file in self.iter_files(q, 'id', team_drive_id, team_drives)]
+
+    def iter_team_drives(self, q=None, fields='id, name', page_size=100, prefetch=True):
+        """Iterates over every team drive, page by page.
+
+        Args:
+            q (str, optional): Search query evaluated by the server, it requires domain admin access.
+            fields (str, optional): Team drive fields retrieved, id and name by default.
+            page_size (int, optional): Team drives per page, up to 100.
+            prefetch (bool, optional): True if you want to download the next page while the current one is consumed.
+
+        Yields:
+            dict: Each team drive with the requested fields.
+        """
+        kwargs = {'pageSize': page_size, 'fields': 'nextPageToken, teamDrives({})'.format(fields)}
+        if q:
+            kwargs['q'] = q
+            kwargs['useDomainAdminAccess'] = True
+        return self.iter_pages(self.service.teamdrives().list, 'teamDrives', prefetch, **kwargs)
+
+    def list_team_drives(self, q=None):
+        """Lists the id and name of every team drive, see iter_team_drives.
+
+        Returns:
+            list: Dicts with the 'id' and 'name' of each team drive.
+        """
+        return [{'id': team_drive['id'], 'name': team_drive['name']} for team_drive in self.iter_team_drives(q)]
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Streaming writers which dump rows to CSV, Parquet or Arrow files one window at a time.
+Parquet and Arrow require pyarrow, imported on first use.
+"""
+import csv
+import io
+import os
+import re
+from collections import Counter
+from itertools import islice
+
+from pygsheet.frames import unique_names
+
+FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def export_file_name(sheet, fmt):
+    """This function returns a file name for a sheet, characters not allowed in file names are replaced by _"""
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', '_', sheet) + FORMATS[fmt]
+
+
+def export_file_names(sheets, fmt):
+    """This function returns a distinct file name for every sheet, see export_file_name
+    Sheets whose names only differ in replaced characters or in case, like a/b and A_b, would write the same file,
+    the index of the sheet is appended to them, as in a_b_0.csv and A_b_1.csv.
+    Args:
+        sheets (list): Sheet names, in spreadsheet order.
+        fmt (str): A choice between ['csv', 'parquet', 'arrow'].
+    Returns:
+        list: File names, in the order of the sheets.
+    """
+    bases = [export_file_name(sheet, fmt)[:-len(FORMATS[fmt])] for sheet in sheets]
+    counts = Counter(base.lower() for base in bases)
+    used = set()
+    names = []
+    for index, base in enumerate(bases):
+        name = base if counts[base.lower()] == 1 else '{}_{}'.format(base, index)
+        while name.lower() in used:
+            name = '{}_{}'.format(name, index)
+        used.add(name.lower())
+        names.append(name + FORMATS[fmt])
+    return names
+
+
+def write_csv(rows, path, **fmtparams):
+    """This function streams rows into a CSV file
+    Args:
+        rows (iterable): Rows of values, empty cells as ''.
+        path (str): Path of the file.
+        **fmtparams: csv.writer format parameters, like delimiter.
+    Returns:
+        int: Number of rows written.
+    Raises:
+        Exception: Any error raised while the rows are produced or written, the partial file is removed.
+    """
+    n_rows = 0
+    output = io.open(path, 'w', newline='', encoding='utf-8')
+    try:
+        with output:
+            writer = csv.writer(output, **fmtparams)
+            for row in rows:
+                writer.writerow(row)
+                n_rows += 1
+    except Exception:
+        os.remove(path)
+        raise
+    return n_rows
+
+
+def infer_arrow_type(values):
+    """This function returns the Arrow type of a column from its values, float64, bool or string.
+    Sheets numbers are doubles returned as ints when they are whole, so every numeric column is float64.
+    """
+    import pyarrow as pa
+    types = set(type(value) for value in values if value is not None and value != '')
+    if types and types <= {int, float}:
+        return pa.float64()
+    if types == {bool}:
+        return pa.bool_()
+    return pa.string()
+
+
+def to_record_batch(schema, rows):
+    """This function builds an Arrow record batch from ragged rows, empty cells become nulls
+    Args:
+        schema (pyarrow.Schema): Schema of the batch.
+        rows (list): Rows of values.
+    Returns:
+        pyarrow.RecordBatch: Batch of the rows.
+    """
+    import pyarrow as pa
+    width = len(schema)
+    columns = zip(*[list(row[:width]) + [''] * (width - len(row)) for row in rows]) if rows else [[]] * width
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_string(field.type):
+            values = [None if value is None or value == '' else str(value) for value in values]
+        else:
+            values = [None if value is None or value == '' else value for value in values]
+        try:
+            arrays.append(pa.array(values, type=field.type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError) as error:
+            raise ValueError('Column {} does not hold {} values only, its type was inferred from the first window: {}'.format(
+                field.name, field.type, error))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_arrow(rows, path, fmt='parquet', header=True, batch_rows=10000):
+    """This function streams rows into a Parquet or Arrow IPC file, one record batch per window of rows
+    Args:
+        rows (iterable): Rows of values, empty cells as '' or None.
+        path (str): Path of the file.
+        fmt (str, optional): A choice between ['parquet', 'arrow'].
+        header (bool, optional): True if the first row holds column names.
+        batch_rows (int, optional): Number of rows of each record batch, column types are inferred from the first one.
+    Returns:
+        int: Number of rows written, without the header.
+    Raises:
+        ValueError: A later batch does not fit the inferred column types, the partial file is removed.
+    """
+    import pyarrow as pa
+    rows = iter(rows)
+    names = [str(name) for name in next(rows, [])] if header else []
+    window = list(islice(rows, batch_rows))
+    width = max([len(names)] + [len(row) for row in window])
+    names = unique_names(names + [str(j) for j in range(len(names), width)])
+    schema = pa.schema([pa.field(name, infer_arrow_type([row[j] if j < len(row) else None for row in window]))
+                        for j, name in enumerate(names)])
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+    n_rows = 0
+    try:
+        while window:
+            writer.write_table(pa.Table.from_batches([to_record_batch(schema, window)]))
+            n_rows += len(window)
+            window = list(islice(rows, batch_rows))
+    except Exception:
+        writer.close()
+        os.remove(path)
+        raise
+    writer.close()
+    return n_rows
+
+
+def export_rows(rows, path, fmt='csv', header=True, batch_rows=10000):
+    """This function streams rows into a file of any supported format
+    Args:
+        rows (iterable): Rows of values.
+        path (str): Path of the file.
+        fmt (str, optional): A choice between ['csv', 'parquet', 'arrow'].
+        header (bool, optional): True if the first row holds column names, only used by typed formats.
+        batch_rows (int, optional): Number of rows of each record batch of typed formats.
+    Returns:
+        int: Number of rows written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError('Unknown export format {}, use one of {}'.format(fmt, sorted(FORMATS)))
+    if fmt == 'csv':
+        return write_csv(rows, path)
+    return write_arrow(rows, path, fmt, header, batch_rows)
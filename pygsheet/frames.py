@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""Columnar conversions between API values and NumPy arrays or pandas DataFrames.
+NumPy is required and pandas is optional, both are imported on first use. When pandas is installed
+its C type inference classifies the columns read, even when NumPy arrays are returned.
+"""
+import sys
+
+SERIAL_EPOCH = '1899-12-30'
+
+
+def unique_names(names):
+    """This function makes column names unique appending .1, .2... to repeated ones"""
+    seen = {}
+    result = []
+    for name in names:
+        if name in seen:
+            seen[name] += 1
+            name = '{}.{}'.format(name, seen[name])
+        else:
+            seen[name] = 0
+        result.append(name)
+    return result
+
+
+def serial_to_datetime(values):
+    """This function converts spreadsheet serial numbers (days since 1899-12-30) to datetime64 values
+    Args:
+        values (numpy.ndarray): Serial numbers, NaN for empty cells.
+    Returns:
+        numpy.ndarray: datetime64[ms] values, NaT for empty cells.
+    """
+    import numpy as np
+    values = np.asarray(values, dtype=np.float64)
+    result = np.datetime64(SERIAL_EPOCH, 'ms') + np.round(np.nan_to_num(values) * 86400000.0).astype('timedelta64[ms]')
+    result[np.isnan(values)] = np.datetime64('NaT')
+    return result
+
+
+INFERRED_KINDS = {'integer': 'number', 'floating': 'number', 'mixed-integer-float': 'number', 'empty': 'number',
+                  'boolean': 'bool', 'string': 'text'}
+
+
+def infer_kind(column):
+    """This function classifies the values of an object column, empty cells aside
+    pandas.api.types.infer_dtype is used when pandas is installed, otherwise the set of types is collected in one pass.
+    Args:
+        column (numpy.ndarray): Object array, None for empty cells.
+    Returns:
+        str: 'number', 'bool', 'text' or 'mixed'.
+    """
+    try:
+        from pandas.api.types import infer_dtype
+    except ImportError:
+        types = set(map(type, column.tolist())) - {type(None)}
+        if types <= {int, float}:
+            return 'number'
+        if types == {bool}:
+            return 'bool'
+        if types == {str}:
+            return 'text'
+        return 'mixed'
+    return INFERRED_KINDS.get(infer_dtype(column, skipna=True), 'mixed')
+
+
+def convert_column(column, dtype=None):
+    """This function converts an object column to its narrowest type, numbers become float64 or int64
+    Types are decided with array operations, numbers are cast in bulk and their empty cells are the NaN of the cast.
+    Args:
+        column (numpy.ndarray): Object array, None or '' for empty cells.
+        dtype (optional): Target NumPy dtype, inferred by default. datetime64 dtypes read serial numbers.
+    Returns:
+        numpy.ndarray: Converted column.
+    Raises:
+        ValueError: The column does not fit an integer dtype, it has empty cells or fractional numbers.
+    """
+    import numpy as np
+    kind = infer_kind(column)
+    empty = None
+    if kind == 'mixed':
+        # cleared cells may be read as '' among numbers or booleans
+        empty = np.equal(column, None) | np.equal(column, '')
+        kind = infer_kind(column[~empty])
+    if kind == 'number':
+        numbers = (column if empty is None else np.where(empty, None, column)).astype(np.float64)
+        empty = np.isnan(numbers)
+    else:
+        numbers = None
+        if empty is None:
+            empty = np.equal(column, None)
+            if kind == 'text':
+                empty |= np.equal(column, '')
+    if dtype is not None:
+        dtype = np.dtype(dtype)
+        if dtype.kind in 'fiuM':
+            values = np.where(empty, np.nan, column).astype(np.float64) if numbers is None else numbers
+            if dtype.kind == 'M':
+                return serial_to_datetime(values).astype(dtype)
+            if dtype.kind in 'iu':
+                if empty.any():
+                    raise ValueError('{} empty cells do not fit a {} column, use a float dtype'.format(int(empty.sum()), dtype))
+                if np.any(np.mod(values, 1) != 0):
+                    raise ValueError('Fractional numbers do not fit a {} column, use a float dtype'.format(dtype))
+                return column.astype(dtype)
+            return values.astype(dtype)
+        if dtype.kind == 'b':
+            return np.where(empty, False, column).astype(bool)
+        return np.where(empty, None, column).astype(dtype)
+    if empty.all():
+        return np.full(len(column), np.nan)
+    if kind == 'bool' and not empty.any():
+        return column.astype(bool)
+    if numbers is None:
+        return np.where(empty, None, column)
+    if not empty.any() and np.all(np.mod(numbers, 1) == 0) and np.all(np.abs(numbers) < 2 ** 53):
+        return numbers.astype(np.int64)
+    return numbers
+
+
+def rows_to_columns(rows, header=True, dtypes=None):
+    """This function builds a rectangular columnar result from ragged API rows, padding missing cells
+    Rows are copied into a preallocated object grid, whose cells are None until they are filled, in a single
+    call when every row has the same length and one row slice at a time otherwise. Columns are converted from its slices.
+    Args:
+        rows (list): Rows of an UNFORMATTED_VALUE response.
+        header (bool, optional): True if the first row holds column names.
+        dtypes (dict or dtype, optional): Column names mapped to NumPy dtypes, or one dtype for every column.
+    Returns:
+        tuple: (names, columns) where columns is a list of NumPy arrays.
+    Raises:
+        ValueError: A column does not fit its dtype.
+    """
+    import numpy as np
+    names = list(rows[0]) if header and rows else []
+    rows = rows[1:] if header else rows
+    lengths = list(map(len, rows))
+    width = max(lengths + [len(names)])
+    grid = np.empty((len(rows), width), dtype=object)
+    if rows and width:
+        if min(lengths) == width:
+            grid[:] = rows
+        else:
+            for i, row in enumerate(rows):
+                grid[i, :len(row)] = row
+    names = unique_names([str(name) for name in names] + list(range(len(names), width)))
+    columns = []
+    for j, name in enumerate(names):
+        dtype = dtypes.get(name) if isinstance(dtypes, dict) else dtypes
+        try:
+            columns.append(convert_column(grid[:, j], dtype))
+        except ValueError as error:
+            raise ValueError('Column {}: {}'.format(name, error))
+    return names, columns
+
+
+def to_frame(names, columns, kind='pandas'):
+    """This function packs named columns as a pandas DataFrame or an ordered dict of NumPy arrays
+    Args:
+        names (list): Column names.
+        columns (list): NumPy arrays.
+        kind (str, optional): A choice between ['pandas', 'numpy'].
+    Returns:
+        pandas.DataFrame or collections.OrderedDict.
+    """
+    from collections import OrderedDict
+    data = OrderedDict(zip(names, columns))
+    if kind == 'numpy':
+        return data
+    import pandas
+    return pandas.DataFrame(data, columns=names)
+
+
+def frame_columns(frame):
+    """This function splits a pandas DataFrame, a mapping of arrays or a 2D NumPy array in named columns
+    Returns:
+        tuple: (names, columns) where columns is a list of NumPy arrays.
+    """
+    import numpy as np
+    if hasattr(frame, 'iloc') and hasattr(frame, 'columns'):
+        return [str(name) for name in frame.columns], [frame.iloc[:, j].to_numpy() for j in range(frame.shape[1])]
+    if hasattr(frame, 'keys'):
+        return [str(name) for name in frame.keys()], [np.asarray(frame[name]) for name in frame.keys()]
+    frame = np.asarray(frame)
+    if frame.ndim == 1:
+        frame = frame.reshape(-1, 1)
+    return [str(j) for j in range(frame.shape[1])], [frame[:, j] for j in range(frame.shape[1])]
+
+
+def is_missing(value):
+    """This function tells whether a value is None, NaN, NaT or pandas.NA, which are written as empty cells"""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except (TypeError, ValueError):
+        # pandas.NA compares to NA, whose truth value is ambiguous, as the one of arrays
+        return value is getattr(sys.modules.get('pandas'), 'NA', None)
+
+
+def encode_value(value):
+    """This function encodes a single Python or NumPy value as a RAW input value, dates become serial numbers"""
+    import datetime
+    import decimal
+    import math
+    if is_missing(value):
+        return ''
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else ''
+    if isinstance(value, decimal.Decimal):
+        return float(value) if value.is_finite() else ''
+    if isinstance(value, datetime.datetime):
+        return (value.replace(tzinfo=None) - datetime.datetime(1899, 12, 30)).total_seconds() / 86400.0
+    if isinstance(value, datetime.date):
+        return (value - datetime.date(1899, 12, 30)).days
+    if isinstance(value, datetime.time):
+        return (value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6) / 86400.0
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds() / 86400.0
+    return value
+
+
+def encode_float(values):
+    import numpy as np
+    values = np.asarray(values, dtype=np.float64)
+    invalid = ~np.isfinite(values)
+    if invalid.any():
+        values = values.astype(object)
+        values[invalid] = ''
+    return values.tolist()
+
+
+def encode_column(column):
+    """This function encodes a column as a list of RAW input values, typed columns are converted in bulk
+    Args:
+        column (numpy.ndarray): Column values.
+    Returns:
+        list: Values as native Python numbers and strings, dates as serial numbers and NaN, NaT and pandas.NA as empty cells.
+    """
+    import numpy as np
+    column = np.asarray(column)
+    kind = column.dtype.kind
+    if kind == 'M':
+        return encode_float((column - np.datetime64(SERIAL_EPOCH)) / np.timedelta64(1, 'D'))
+    if kind == 'm':
+        return encode_float(column / np.timedelta64(1, 'D'))
+    if kind == 'f':
+        return encode_float(column)
+    if kind in 'iubUS':
+        return column.tolist()
+    return np.frompyfunc(encode_value, 1, 1)(column).tolist()
+
+
+def encode_rows(frame, header=True, chunk_rows=10000):
+    """This function encodes a frame as rows of RAW input values, converting chunk_rows rows at a time
+    Args:
+        frame (pandas.DataFrame or dict or numpy.ndarray): Data to encode.
+        header (bool, optional): True if you want the column names as first row.
+        chunk_rows (int, optional): Number of rows converted at once.
+    Yields:
+        list: Encoded rows.
+    """
+    names, columns = frame_columns(frame)
+    if header:
+        yield names
+    n_rows = len(columns[0]) if columns else 0
+    for start in range(0, n_rows, chunk_rows):
+        for row in zip(*[encode_column(column[start:start + chunk_rows]) for column in columns]):
+            yield list(row)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Compact column-wise storage for large grids of API values.
+Integer columns use the narrowest typed array which holds them, number columns use doubles
+and any other column stores codes into a string table shared by the whole grid. A few text
+cells in a number column, like its header, are kept aside instead of turning it into codes.
+"""
+import sys
+from array import array
+from itertools import count
+
+BLOCK_ROWS = 1024
+EMPTY = 1
+EXTRA = 2
+
+
+def int_typecode(low, high):
+    """This function returns the narrowest signed array typecode which holds every integer between low and high, None if there is none"""
+    for code in 'bhiq':
+        bits = array(code).itemsize * 8
+        if -2 ** (bits - 1) <= low and high < 2 ** (bits - 1):
+            return code
+    return None
+
+
+def code_typecode(size):
+    """This function returns the narrowest unsigned array typecode which holds codes of a table with size entries"""
+    for code in 'BHIL':
+        if size <= 2 ** (array(code).itemsize * 8):
+            return code
+    return 'Q'
+
+
+class CompactGrid:
+    """Read only grid of values stored column-wise in typed arrays.
+    Empty and missing cells are read back as empty strings, as the API writes them.
+    """
+    def __init__(self, n_rows, kinds, columns, masks, extras, table):
+        """Class parameters, use CompactGrid.from_rows to build a grid
+        Args:
+            n_rows (int): Number of rows.
+            kinds (list): 'n' for number columns and 't' for table coded columns.
+            columns (list): Typed arrays, one for each column.
+            masks (list): bytearray flagging the EMPTY and EXTRA cells of each number column, None when it has none.
+            extras (list): Values of the EXTRA cells of each number column keyed by row, None when it has none.
+            table (list): Values referenced by the codes of 't' columns, the code 0 is the empty string.
+        """
+        self.n_rows = n_rows
+        self.kinds = kinds
+        self.columns = columns
+        self.masks = masks
+        self.extras = extras
+        self.table = table
+
+    @classmethod
+    def from_rows(cls, rows, width=None):
+        """This function builds a grid from ragged rows, as the API returns them
+        Args:
+            rows (list): Rows of values, missing trailing cells are empty.
+            width (int, optional): Number of columns, the length of the longest row by default.
+        Returns:
+            CompactGrid: Grid holding the rows.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        width = max([len(row) for row in rows] or [0]) if width is None else width
+        table = ['']
+        index = {(str, ''): 0}
+        kinds, columns, masks, extras = [], [], [], []
+        for j in range(width):
+            values = [row[j] if j < len(row) else '' for row in rows]
+            flags = [EMPTY if value is None or value == '' else 0 if type(value) in (int, float) else EXTRA for value in values]
+            kind, column, mask, extra = 't', None, None, None
+            n_extra = flags.count(EXTRA)
+            if n_extra * 8 <= len(values) and flags.count(0):
+                numbers = [value for value, flag in zip(values, flags) if not flag]
+                code = int_typecode(min(numbers), max(numbers)) if set(map(type, numbers)) == {int} else 'd'
+                if code:
+                    kind, column = 'n', array(code, [0 if flag else value for value, flag in zip(values, flags)])
+                    mask = bytearray(flags) if any(flags) else None
+                    extra = {i: values[i] for i, flag in enumerate(flags) if flag == EXTRA} if n_extra else None
+            if column is None:
+                codes = array('L')
+                for value, flag in zip(values, flags):
+                    if flag == EMPTY:
+                        codes.append(0)
+                        continue
+                    key = (type(value), value)
+                    code = index.get(key)
+                    if code is None:
+                        code = index[key] = len(table)
+                        table.append(value)
+                    codes.append(code)
+                column = codes
+            kinds.append(kind)
+            columns.append(column)
+            masks.append(mask)
+            extras.append(extra)
+        code = code_typecode(len(table))
+        columns = [array(code, column) if kind == 't' else column for kind, column in zip(kinds, columns)]
+        return cls(len(rows), kinds, columns, masks, extras, table)
+
+    @property
+    def n_cols(self):
+        return len(self.columns)
+
+    @property
+    def shape(self):
+        return (self.n_rows, self.n_cols)
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the grid, arrays, masks and string table included"""
+        size = sum(column.itemsize * len(column) for column in self.columns)
+        size += sum(len(mask) for mask in self.masks if mask is not None)
+        size += sum(sys.getsizeof(extra) for extra in self.extras if extra is not None)
+        return size + sys.getsizeof(self.table) + sum(sys.getsizeof(value) for value in self.table)
+
+    def __len__(self):
+        return self.n_rows
+
+    def __iter__(self):
+        return self.iter_rows()
+
+    def __getitem__(self, key):
+        """Indexing follows NumPy: grid[i] is a row list, grid[i, j] a value, grid[:, j] a column list
+        and any other combination of slices a new CompactGrid sharing the string table.
+        """
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+        if isinstance(rows, int):
+            rows = range(self.n_rows)[rows]
+            if isinstance(cols, int):
+                return self.decode(range(self.n_cols)[cols], rows, rows + 1)[0]
+            return [self.decode(j, rows, rows + 1)[0] for j in range(self.n_cols)[cols]]
+        if isinstance(cols, int):
+            return self.decode(range(self.n_cols)[cols])[rows]
+        cols = range(self.n_cols)[cols]
+        selected = range(self.n_rows)[rows]
+        extras = []
+        for j in cols:
+            extra = self.extras[j]
+            if extra is not None:
+                extra = {selected.index(i): value for i, value in extra.items() if i in selected} or None
+            extras.append(extra)
+        return CompactGrid(len(selected), [self.kinds[j] for j in cols], [self.columns[j][rows] for j in cols],
+                           [None if self.masks[j] is None else self.masks[j][rows] for j in cols],
+                           extras, self.table)
+
+    def decode(self, j, start=0, stop=None):
+        """This function returns the values of a column between two rows
+        Args:
+            j (int): Column index.
+            start (int, optional): First row.
+            stop (int, optional): Row after the last one, the end of the grid by default.
+        Returns:
+            list: Values of the column.
+        """
+        values = self.columns[j][start:stop].tolist()
+        if self.kinds[j] == 't':
+            table = self.table
+            return [table[code] for code in values]
+        mask = self.masks[j]
+        if mask is None:
+            return values
+        extra = self.extras[j] or {}
+        return [value if not flag else '' if flag == EMPTY else extra[i] for i, value, flag in zip(count(start), values, mask[start:stop])]
+
+    def column(self, j):
+        """This function returns the values of a column as a list"""
+        return self.decode(j)
+
+    def iter_columns(self):
+        """This function iterates over the columns of the grid, each one decoded as a list"""
+        for j in range(self.n_cols):
+            yield self.decode(j)
+
+    def iter_rows(self, block_rows=BLOCK_ROWS):
+        """This function iterates over the rows of the grid, decoding block_rows rows at a time
+        Args:
+            block_rows (int, optional): Number of rows decoded at once.
+        Yields:
+            list: Values of each row.
+        """
+        for start in range(0, self.n_rows, block_rows):
+            stop = min(start + block_rows, self.n_rows)
+            columns = [self.decode(j, start, stop) for j in range(self.n_cols)]
+            if not columns:
+                for i in range(start, stop):
+                    yield []
+                continue
+            for row in zip(*columns):
+                yield list(row)
+
+    def to_rows(self):
+        """This function returns the grid as a list of rows, as the write methods send them"""
+        return list(self.iter_rows())
+
+
+def as_rows(data):
+    """This function returns the rows of a CompactGrid, any other data is returned as it is"""
+    return data.to_rows() if isinstance(data, CompactGrid) else data
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Chunking of tabular files for server side imports.
+Delimited text is pasted with pasteData in chunks split at record boundaries, without parsing it,
+and large files are converted by Drive on upload. Parquet requires pyarrow, imported on first use.
+"""
+import csv
+import io
+import os
+
+PASTE_CHUNK_BYTES = 2 * 1024 * 1024
+DRIVE_IMPORT_MIN_BYTES = 20 * 1024 * 1024
+SHEETS_MIME_TYPE = 'application/vnd.google-apps.spreadsheet'
+TEXT_FORMATS = {'.csv': ',', '.tsv': '\t', '.txt': ','}
+DRIVE_FORMATS = {'.csv': 'csv', '.tsv': 'text/tab-separated-values', '.txt': 'csv', '.xlsx': 'xlsx', '.xls': 'xls'}
+
+
+def choose_import_method(path, new_sheet=True, at_origin=True):
+    """This function chooses the cheaper import of a file, the paste of its chunks or its conversion by Drive
+    Args:
+        path (str): Path of the file.
+        new_sheet (bool, optional): True if the data goes to a sheet which does not exist yet.
+        at_origin (bool, optional): True if the data starts at A1.
+    Returns:
+        str: 'drive' for spreadsheet files and large delimited files imported into a new sheet, 'paste' otherwise.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in DRIVE_FORMATS or not (new_sheet and at_origin):
+        return 'paste'
+    if extension not in TEXT_FORMATS or os.path.getsize(path) >= DRIVE_IMPORT_MIN_BYTES:
+        return 'drive'
+    return 'paste'
+
+
+def iter_text_chunks(path, chunk_bytes=PASTE_CHUNK_BYTES, delimiter=',', encoding='utf-8'):
+    """This function reads a delimited text file in chunks which end at a record boundary
+    Quoted fields may hold line breaks, a line only ends a record when it closes every open quote.
+    Args:
+        path (str): Path of the file.
+        chunk_bytes (int, optional): Approximate size of each chunk.
+        delimiter (str, optional): Delimiter of the text.
+        encoding (str, optional): Encoding of the file.
+    Yields:
+        tuple: (text, number of records, number of columns) of each chunk, quoted delimiters may overcount the columns.
+    """
+    lines, size, n_records, width, quotes, fields = [], 0, 0, 0, 0, 1
+    with io.open(path, encoding=encoding, newline='') as source:
+        for line in source:
+            lines.append(line)
+            size += len(line)
+            quotes += line.count('"')
+            fields += line.count(delimiter)
+            if quotes % 2:
+                continue
+            n_records += 1
+            width = max(width, fields)
+            quotes, fields = 0, 1
+            if size >= chunk_bytes:
+                yield ''.join(lines), n_records, width
+                lines, size, n_records, width = [], 0, 0, 0
+    if lines:
+        yield ''.join(lines), n_records + (1 if quotes else 0), max(width, fields)
+
+
+def count_records(path, delimiter=',', encoding='utf-8'):
+    """This function counts the records of a delimited text file, records may span several lines
+    Args:
+        path (str): Path of the file.
+        delimiter (str, optional): Delimiter of the text.
+        encoding (str, optional): Encoding of the file.
+    Returns:
+        int: Number of records, the header included.
+    """
+    return sum(n_records for text, n_records, width in iter_text_chunks(path, delimiter=delimiter, encoding=encoding))
+
+
+def iter_parquet_chunks(path, chunk_bytes=PASTE_CHUNK_BYTES, delimiter=',', header=True, batch_rows=10000):
+    """This function serializes a Parquet file as delimited text chunks, one record batch at a time
+    Args:
+        path (str): Path of the file.
+        chunk_bytes (int, optional): Approximate size of each chunk.
+        delimiter (str, optional): Delimiter of the text.
+        header (bool, optional): True if you want the column names as first record.
+        batch_rows (int, optional): Number of rows read at once.
+    Yields:
+        tuple: (text, number of records, number of columns) of each chunk.
+    """
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    width = len(parquet.schema_arrow.names)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator='\n')
+    n_records = 0
+    if header:
+        writer.writerow(parquet.schema_arrow.names)
+        n_records += 1
+    for batch in parquet.iter_batches(batch_size=batch_rows):
+        columns = [column.to_pylist() for column in batch.columns]
+        for row in zip(*columns):
+            writer.writerow(['' if value is None else value for value in row])
+            n_records += 1
+            if buffer.tell() >= chunk_bytes:
+                yield buffer.getvalue(), n_records, width
+                buffer.seek(0)
+                buffer.truncate()
+                n_records = 0
+    if n_records:
+        yield buffer.getvalue(), n_records, width
+
+
+def paste_request(sheet_id, row, col, text, delimiter=','):
+    """This function builds a pasteData request of delimited text
+    Args:
+        sheet_id (int): Id of the sheet.
+        row (int): Zero based row of the top left cell.
+        col (int): Zero based column of the top left cell.
+        text (str): Delimited records, a final line break is dropped so it does not paste an empty row.
+        delimiter (str, optional): Delimiter of the text.
+    Returns:
+        dict: pasteData request, values are parsed as if they were typed by a user.
+    """
+    if text.endswith('\n'):
+        text = text[:-2] if text.endswith('\r\n') else text[:-1]
+    return {"pasteData": {"coordinate": {"sheetId": sheet_id, "rowIndex": row, "columnIndex": col},
+                          "data": text, "type": "PASTE_NORMAL", "delimiter": delimiter}}
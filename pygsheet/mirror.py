@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+
+def changed_blocks(old, new, gap=1):
+    """This function groups the cells which differ between two grids in rectangular blocks
+    Args:
+        old (list): Last known rows.
+        new (list): New rows, cells missing in any grid are compared as empty strings.
+        gap (int, optional): Maximum number of unchanged cells between two changed ones of a row which are written together.
+    Returns:
+        list: (first_row, first_col, last_row, last_col) zero based inclusive blocks.
+    """
+    blocks = []
+    open_blocks = {}
+    for i in range(max(len(old), len(new))):
+        old_row = old[i] if i < len(old) else []
+        new_row = new[i] if i < len(new) else []
+        runs = []
+        for j in range(max(len(old_row), len(new_row))):
+            old_value = old_row[j] if j < len(old_row) else ''
+            new_value = new_row[j] if j < len(new_row) else ''
+            if old_value != new_value:
+                if runs and j - runs[-1][1] <= gap + 1:
+                    runs[-1][1] = j
+                else:
+                    runs.append([j, j])
+        current = {}
+        for first_col, last_col in runs:
+            first_row = open_blocks.pop((first_col, last_col), i)
+            current[(first_col, last_col)] = first_row
+        for (first_col, last_col), first_row in open_blocks.items():
+            blocks.append((first_row, first_col, i - 1, last_col))
+        open_blocks = current
+    last = max(len(old), len(new)) - 1
+    for (first_col, last_col), first_row in open_blocks.items():
+        blocks.append((first_row, first_col, last, last_col))
+    return sorted(blocks)
+
+
+class MirroredRange:
+    """Local copy of a sheet range which only writes the cells that changed since the last push
+    """
+    def __init__(self, manager, sheet, start=(1, 1), value_input='USER_ENTERED', gap=1):
+        """Class parameters
+        Args:
+            manager (SpreadsheetManager): Manager of the spreadsheet.
+            sheet (str): Sheet name.
+            start (:obj: `tuple` of :obj: `int`, optional): (row, column) coordinates of the top left cell, A1 by default.
+            value_input (str, optional): A choice between ['RAW', 'USER_ENTERED'], USER_ENTERED by default.
+            gap (int, optional): Maximum number of unchanged cells between changed ones of a row which are written together.
+        """
+        self.manager = manager
+        self.sheet = sheet
+        self.start = start
+        self.value_input = value_input
+        self.gap = gap
+        self.grid = []
+
+    def pull(self, n_rows=None, n_cols=None):
+        """This function loads the current values of the range as the last known grid
+        Args:
+            n_rows (int, optional): Number of rows of the range, up to the end of the sheet by default.
+            n_cols (int, optional): Number of columns of the range, up to the end of the sheet by default.
+        Returns:
+            list: Rows of the range.
+        """
+        manager = self.manager
+        manager.get_sheets_id(self.sheet)
+        grid_properties = manager.sheets_properties.get(self.sheet, {}).get('gridProperties', {})
+        end = (self.start[0] + n_rows - 1 if n_rows else grid_properties.get('rowCount', 1000),
+               self.start[1] + n_cols - 1 if n_cols else grid_properties.get('columnCount', 26))
+        response = manager.execute(manager.service.spreadsheets().values().get(spreadsheetId=manager.spreadsheetId,
+            range=manager.format_range(self.sheet, (self.start, end)), valueRenderOption='UNFORMATTED_VALUE'))
+        self.grid = [list(row) for row in response.get('values', [])]
+        return self.grid
+
+    def diff(self, grid):
+        """This function computes the blocks which must be written to turn the last known grid into a new one
+        Args:
+            grid (list): New rows.
+        Returns:
+            dict: Values of every changed block keyed by (sheet, sheet_range), as write_ranges takes them.
+        """
+        ranges = {}
+        for first_row, first_col, last_row, last_col in changed_blocks(self.grid, grid, self.gap):
+            values = []
+            for i in range(first_row, last_row + 1):
+                row = grid[i] if i < len(grid) else []
+                values.append([row[j] if j < len(row) else '' for j in range(first_col, last_col + 1)])
+            sheet_range = ((self.start[0] + first_row, self.start[1] + first_col), (self.start[0] + last_row, self.start[1] + last_col))
+            ranges[(self.sheet, sheet_range)] = values
+        return ranges
+
+    def push(self, grid):
+        """This function writes the cells of a new grid which changed since the last push, in a single values().batchUpdate
+        Args:
+            grid (list): New rows of the range.
+        Returns:
+            dict: Number of 'cells' and 'blocks' written and the API 'responses'.
+        """
+        grid = [list(row) for row in grid]
+        ranges = self.diff(grid)
+        responses = self.manager.write_ranges(ranges, value_input=self.value_input) if ranges else []
+        self.grid = grid
+        return {'cells': sum(len(values) * len(values[0]) for values in ranges.values()), 'blocks': len(ranges), 'responses': responses}
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class MultiSpreadsheetReader:
+    """Utility class for reading the same ranges from many spreadsheets at once.
+    It reuses the credentials and service of a single manager, every request of the worker threads runs
+    on a keep-alive connection checked out of the session pool.
+    """
+    def __init__(self, manager, max_workers=8):
+        """Class parameters
+        Args:
+            manager (SpreadsheetManager): Manager whose credentials and service are shared by every read.
+            max_workers (int, optional): Maximum number of spreadsheets read at the same time.
+        """
+        self.manager = manager
+        self.max_workers = max_workers
+
+    def read_spreadsheet(self, spreadsheet_id, ranges, omit_empty=False):
+        """This function reads several ranges of a spreadsheet in a single request
+        Args:
+            spreadsheet_id (str): id of spreadsheet.
+            ranges (list): Sheet names or (sheet, sheet_range) tuples, as in SpreadsheetManager.read_ranges.
+            omit_empty (bool, optional): True if you want to skip empty rows.
+        Returns:
+            dict: Data stored in every range, keyed by the requested range.
+        """
+        return self.manager.read_ranges(ranges, omit_empty, spreadsheet_id=spreadsheet_id)
+
+    def read(self, spreadsheet_ids, ranges, omit_empty=False):
+        """This function reads the same ranges from every spreadsheet on a bounded pool of workers
+        Args:
+            spreadsheet_ids (iterable): ids of the spreadsheets.
+            ranges (list): Sheet names or (sheet, sheet_range) tuples, as in SpreadsheetManager.read_ranges.
+            omit_empty (bool, optional): True if you want to skip empty rows.
+        Yields:
+            tuple: (spreadsheet_id, data, error) as soon as each spreadsheet is read, data is None when the read failed.
+        """
+        ranges = list(ranges)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {}
+        try:
+            for spreadsheet_id in spreadsheet_ids:
+                futures[executor.submit(self.read_spreadsheet, spreadsheet_id, ranges, omit_empty)] = spreadsheet_id
+            for future in as_completed(futures):
+                error = future.exception()
+                yield futures[future], None if error else future.result(), error
+        finally:
+            # the caller may stop iterating early, reads not started yet are dropped
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
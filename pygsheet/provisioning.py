@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import json
+import random
+import time
+
+STAGES = ('copy', 'share', 'load')
+
+
+class TemplateProvisioner:
+    """Creates many spreadsheets from a template running copy, share and data load as concurrent stages.
+    Each stage has its own bounded pool of workers and a spreadsheet enters the share and load stages as soon
+    as its copy exists, so the run takes about as long as its slowest stage instead of the sum of every step.
+    Copies are created straight into the folder, which saves the move of each file.
+    """
+    def __init__(self, drive_manager, template_id, folder=None, domain=None, user_list=None, app_name='PyGsheet',
+                 value_input='USER_ENTERED', copy_workers=4, share_workers=4, load_workers=4, retries=2, backoff=1.0):
+        """Class parameters
+        Args:
+            drive_manager (DriveManager): Manager used for copies and permissions, its session is shared by the spreadsheet managers.
+            template_id (str): Id of the template spreadsheet.
+            folder (str, optional): Id of the folder of the new spreadsheets, the template folder by default.
+            domain (str, optional): Domain every spreadsheet is shared with.
+            user_list (list, optional): Emails of the users every spreadsheet is shared with.
+            app_name (str, optional): Just a name for the spreadsheet managers.
+            value_input (str, optional): A choice between ['RAW', 'USER_ENTERED'], USER_ENTERED by default.
+            copy_workers (int, optional): Maximum number of copies running at the same time.
+            share_workers (int, optional): Maximum number of spreadsheets being shared at the same time.
+            load_workers (int, optional): Maximum number of data loads running at the same time.
+            retries (int or dict, optional): Retries of a stage failed by a transient error, or a dict of retries keyed by stage name.
+                Copies are not idempotent, a copy which timed out may exist already, so they are only retried on quota errors.
+            backoff (float, optional): Seconds waited before the first retry of a stage, doubled on every retry.
+        """
+        self.drive_manager = drive_manager
+        self.template_id = template_id
+        self.folder = folder
+        self.domain = domain
+        self.user_list = user_list
+        self.app_name = app_name
+        self.value_input = value_input
+        self.workers = {'copy': copy_workers, 'share': share_workers, 'load': load_workers}
+        self.retries = retries if isinstance(retries, dict) else {stage: retries for stage in STAGES}
+        self.backoff = backoff
+
+    def provision(self, jobs, manifest_path=None):
+        """This function creates a spreadsheet for every job
+        Args:
+            jobs (list): Names of the new spreadsheets, or dicts with its 'name' and optionally the 'data' to write,
+                as write_ranges takes it or as a callable which gets the SpreadsheetManager, and the 'domain'
+                and 'user_list' it is shared with, when they differ from the provisioner ones.
+            manifest_path (str, optional): Path of a JSON file where the manifest is written.
+        Returns:
+            list: Manifest with a dict for every job, in order, with its 'name', 'spreadsheet_id' and the 'status',
+            'attempts', 'seconds' and 'error' of each stage in 'stages'.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait
+        jobs = [{'name': job} if isinstance(job, str) else dict(job) for job in jobs]
+        manifest = [{'name': job['name'], 'spreadsheet_id': None,
+                     'stages': {stage: {'status': 'pending', 'attempts': 0, 'seconds': 0.0, 'error': None} for stage in STAGES}}
+                    for job in jobs]
+        pools = {stage: ThreadPoolExecutor(max_workers=self.workers[stage]) for stage in STAGES}
+        downstream = []
+
+        def copy(job, entry):
+            if self.run_stage('copy', entry, self.copy, job):
+                downstream.append(pools['share'].submit(self.run_stage, 'share', entry, self.share, job, entry['spreadsheet_id']))
+                downstream.append(pools['load'].submit(self.run_stage, 'load', entry, self.load, job, entry['spreadsheet_id']))
+            else:
+                entry['stages']['share']['status'] = entry['stages']['load']['status'] = 'skipped'
+
+        try:
+            wait([pools['copy'].submit(copy, job, entry) for job, entry in zip(jobs, manifest)])
+            wait(downstream)
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+        if manifest_path:
+            self.write_manifest(manifest, manifest_path)
+        return manifest
+
+    def run_stage(self, stage, entry, function, *args):
+        """This function runs a stage of a job, retrying transient errors with exponential backoff and jitter
+        Errors are classified by the scheduler, the copy stage is the only one which is not idempotent.
+        Returns:
+            bool: True if the stage succeeded.
+        """
+        record = entry['stages'][stage]
+        start = time.time()
+        while True:
+            record['attempts'] += 1
+            try:
+                result = function(*args)
+                if stage == 'copy':
+                    entry['spreadsheet_id'] = result
+                record['status'], record['error'] = 'done', None
+                break
+            except Exception as error:
+                record['status'], record['error'] = 'failed', error
+                if record['attempts'] > self.retries.get(stage, 0) or \
+                        not self.drive_manager.scheduler.is_retryable(error, idempotent=stage != 'copy'):
+                    break
+            time.sleep(self.backoff * 2 ** (record['attempts'] - 1) * random.uniform(0.5, 1.0))
+        record['seconds'] = time.time() - start
+        return record['status'] == 'done'
+
+    def copy(self, job):
+        response = self.drive_manager.copy_file(self.template_id, new_name=job['name'], new_folder=self.folder)
+        return response['id']
+
+    def share(self, job, spreadsheet_id):
+        domain = job.get('domain', self.domain)
+        user_list = job.get('user_list', self.user_list)
+        if not domain and not user_list:
+            return
+        for result in self.drive_manager.share_many([spreadsheet_id], domain=domain, user_list=user_list):
+            if result['error'] is not None:
+                raise result['error']
+
+    def load(self, job, spreadsheet_id):
+        data = job.get('data')
+        if not data:
+            return
+        from pygsheet.pygsheet import SpreadsheetManager
+        manager = SpreadsheetManager(self.app_name, spreadsheetId=spreadsheet_id, scheduler=self.drive_manager.scheduler,
+                                     session=self.drive_manager.session, lazy=True)
+        if callable(data):
+            data(manager)
+        else:
+            manager.write_ranges(data, value_input=self.value_input)
+
+    @staticmethod
+    def write_manifest(manifest, path):
+        """This function writes a manifest as JSON, errors as their messages"""
+        with open(path, 'w') as output:
+            json.dump([dict(entry, stages={stage: dict(record, error=None if record['error'] is None else repr(record['error']))
+                                           for stage, record in entry['stages'].items()}) for entry in manifest], output, indent=2)
@@ -1,39 +1,47 @@
 # -*- coding: utf-8 -*-
-from oauth2client import tools
-from webcolors import name_to_rgb
+import json
+import time
+from collections import deque
+from itertools import count
 
-class SpreadsheetManager:
+from pygsheet.grid import CompactGrid, as_rows
+from pygsheet.ranges import GridRange
+
+MAX_BATCH_REQUESTS = 500
+MAX_BATCH_BYTES = 2 * 1024 * 1024
+
+class SpreadsheetManager(object):
     """Utility class ad hoc for drive spreadsheets interaction
      """
-    def __init__(self, app_name, spreadsheetId=None, with_pipeline=False, cred_path=None):
+    def __init__(self, app_name, spreadsheetId=None, with_pipeline=False, cred_path=None, metadata_ttl=None, scheduler=None, session=None, lazy=False):
         """Class parameters
         Args:
             spreadsheetId (str): id of spreadsheet (For: https://docs.google.com/spreadsheets/d/<spreadsheetId>/).
             app_name (str): Just a name for class instance.
+            metadata_ttl (float, optional): Seconds after which cached sheet metadata is reloaded, never by default.
+            scheduler (RequestScheduler, optional): Scheduler which throttles and retries every call, the session one by default.
+            session (Session, optional): Credentials, connections and services shared with other managers, a new one by default.
+            lazy (bool, optional): True if you want to build the service, create the spreadsheet and load sheet metadata on first use.
         """
+        from pygsheet.session import Session
+        self.session = session or Session(app_name, cred_path=cred_path, scheduler=scheduler)
+        self.scheduler = scheduler or self.session.scheduler
         self.app_name = app_name
-        self.cred_path = None
-        if cred_path:
-            self.service = self.get_service(cred_path)
-            self.cred_path = cred_path
-        else:
-            self.service = self.get_service()
+        self.cred_path = cred_path
+        self._service = None
+        self._spreadsheet_id = spreadsheetId
+        self._flags = None
 
-        self.spreadsheetId = None
-        if spreadsheetId:
-            self.spreadsheetId = spreadsheetId
-        else:
-            self.create_spreadsheet(app_name)
-
-        self.sheets_id = self.get_sheets_id()
+        self.metadata_ttl = metadata_ttl
+        self.metadata_time = None
+        self.sheets_properties = {}
+        self.sheets_id = {}
 
-        self.app_name = app_name
-        self.flags = None
-        try:
-            import argparse
-            self.flags = argparse.ArgumentParser(parents=[tools.argparser], conflict_handler='resolve').parse_args()
-        except ImportError:
-            self.flags = None
+        if not lazy:
+            self.service = self.get_service(cred_path)
+            if not spreadsheetId:
+                self.create_spreadsheet(app_name)
+            self.get_sheets_id()
 
         self.with_pipeline = with_pipeline
         if self.with_pipeline:
@@ -41,21 +49,118 @@ class SpreadsheetManager:
             
         self.drive_manager = None
 
+    @property
+    def service(self):
+        """Sheets service, built on first use"""
+        if self._service is None:
+            self._service = self.get_service(self.cred_path)
+        return self._service
+
+    @service.setter
+    def service(self, service):
+        self._service = service
+
+    @property
+    def spreadsheetId(self):
+        """id of spreadsheet, a new spreadsheet is created on first use when none was given"""
+        if self._spreadsheet_id is None:
+            self.create_spreadsheet(self.app_name)
+        return self._spreadsheet_id
+
+    @spreadsheetId.setter
+    def spreadsheetId(self, spreadsheet_id):
+        self._spreadsheet_id = spreadsheet_id
+
+    @property
+    def flags(self):
+        """OAuth command line flags, parsed on first use ignoring the arguments of the host process"""
+        if self._flags is None:
+            try:
+                import argparse
+                from oauth2client import tools
+                self._flags = argparse.ArgumentParser(parents=[tools.argparser], conflict_handler='resolve').parse_known_args()[0]
+            except ImportError:
+                self._flags = None
+        return self._flags
+
     def write_data_in_range(self, data, sheet, sheet_range=None, value_input='USER_ENTERED'):
         """This function write into a sheet a specified data list
         Args:
             data (:obj:`list` of :obj:`tuple` of :obj:`tuple`): data list which we want to write.
+            data (CompactGrid): Another implementation of data, as read_grid returns it.
             sheet (str): Sheet name.
             sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`, optional): A tuple with two coordinates which delimitate a sheet range for write, all sheet by default.
             sheet_range (str, optional): Another implementation of sheet range which suports excel range format, all sheet by default.
         """
         range_formated = self.format_range(sheet, sheet_range)
+        data = as_rows(data)
         if self.with_pipeline:
-
-            self.pipeline.append(None)  # TODO: implementation
+            self.pipeline.append(("values", {"range": range_formated, "values": data, "valueInputOption": value_input}))
         else:
-            self.service.spreadsheets().values().update(spreadsheetId=self.spreadsheetId,
-                range=range_formated, body={'values': data}, valueInputOption=value_input).execute()
+            self.execute(self.service.spreadsheets().values().update(spreadsheetId=self.spreadsheetId,
+                range=range_formated, body={'values': data}, valueInputOption=value_input))
+
+    def write_ranges(self, ranges, value_input='USER_ENTERED', max_bytes=MAX_BATCH_BYTES):
+        """This function writes several ranges, even from different sheets, using as few requests as possible
+        Args:
+            ranges (dict): Data lists or CompactGrid objects keyed by sheet name or by (sheet, sheet_range) tuples, where sheet_range is a coordinates tuple or an excel range.
+            value_input (str, optional): A choice between ['RAW', 'USER_ENTERED'], USER_ENTERED by default.
+            max_bytes (int, optional): Maximum serialized payload size sent in a single values().batchUpdate.
+        Returns:
+            list: An UpdateValuesResponse for every range, in order. Empty in pipeline mode.
+        """
+        operations = []
+        for item, data in ranges.items():
+            range_formated = self.format_range(item, None) if isinstance(item, str) else self.format_range(*item)
+            operations.append(("values", {"range": range_formated, "values": as_rows(data), "valueInputOption": value_input}))
+        if self.with_pipeline:
+            self.pipeline.extend(operations)
+            return []
+        responses = []
+        for kind, value_input, batch in self.split_pipeline(operations, max_bytes=max_bytes):
+            responses.extend(self.execute_batch(kind, value_input, batch))
+        return responses
+
+    def write_frame(self, frame, sheet, start=(1, 1), header=True, chunk_rows=10000, value_input='RAW'):
+        """This function writes a DataFrame or NumPy arrays encoded in bulk, dates as serial numbers and NaN as empty cells
+        Args:
+            frame (pandas.DataFrame or dict or numpy.ndarray): Data which we want to write, a mapping of columns or a 2D array.
+            sheet (str): Sheet name.
+            start (:obj: `tuple` of :obj: `int`, optional): (row, column) coordinates of the top left cell, A1 by default.
+            header (bool, optional): True if you want to write column names in the first row. True by default.
+            chunk_rows (int, optional): Number of rows encoded and sent in each request.
+            value_input (str, optional): A choice between ['RAW', 'USER_ENTERED'], RAW by default.
+        Returns:
+            list: An UpdateValuesResponse for every chunk. Empty in pipeline mode.
+        """
+        from itertools import islice
+        from pygsheet.frames import encode_rows
+        rows = encode_rows(frame, header, chunk_rows)
+        responses = []
+        row = start[0]
+        chunk = list(islice(rows, chunk_rows))
+        while chunk:
+            end = (row + len(chunk) - 1, start[1] + max(len(line) for line in chunk) - 1)
+            responses.extend(self.write_ranges({(sheet, ((row, start[1]), end)): chunk}, value_input=value_input))
+            row += len(chunk)
+            chunk = list(islice(rows, chunk_rows))
+        return responses
+
+    def append_frame(self, frame, sheet, header=False, chunk_rows=10000, max_in_flight=2, value_input='RAW'):
+        """This function appends a DataFrame or NumPy arrays encoded in bulk, see write_frame and append_rows
+        Args:
+            frame (pandas.DataFrame or dict or numpy.ndarray): Data which we want to append.
+            sheet (str): Sheet name.
+            header (bool, optional): True if you want to append column names first. False by default.
+            chunk_rows (int, optional): Number of rows encoded and sent in each request.
+            max_in_flight (int, optional): Maximum number of serialized chunks waiting to be sent.
+            value_input (str, optional): A choice between ['RAW', 'USER_ENTERED'], RAW by default.
+        Returns:
+            dict: Summary of the append, see append_rows.
+        """
+        from pygsheet.frames import encode_rows
+        return self.append_rows(encode_rows(frame, header, chunk_rows), sheet, chunk_rows=chunk_rows,
+            max_in_flight=max_in_flight, value_input=value_input)
 
     def read_data_in_range(self, sheet, sheet_range=None, omit_empty=False):
         """This function read from a sheet
@@ -67,20 +172,140 @@ class SpreadsheetManager:
         Returns:
             list: Data stored in sheet's specified range.
         """
-        response = self.service.spreadsheets().values().get(spreadsheetId=self.spreadsheetId,
-            range=self.format_range(sheet, sheet_range), valueRenderOption='UNFORMATTED_VALUE').execute()
-        if 'values' in response and not omit_empty:
-            return [val[0] if len(val) == 1 else {0: None}.get(len(val), val) for val in response['values']]
-        elif 'values' in response and omit_empty:
-            return [val[0] if len(val) == 1 else val for val in response['values'] if len(val) > 0]
+        response = self.execute(self.service.spreadsheets().values().get(spreadsheetId=self.spreadsheetId,
+            range=self.format_range(sheet, sheet_range), valueRenderOption='UNFORMATTED_VALUE'))
+        return self.process_values(response, omit_empty)
+
+    def read_frame(self, sheet, sheet_range=None, header=True, dtypes=None, kind='pandas'):
+        """This function reads a range as typed columns, padding ragged rows, it requires NumPy and pandas for DataFrames
+        Args:
+            sheet (str): Sheet name.
+            sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`, optional): A tuple with two coordinates which delimitate a sheet range for read, all sheet by default.
+            sheet_range (str, optional): Another implementation of sheet range which suports excel range format, all sheet by default.
+            header (bool, optional): True if the first row holds column names. True by default.
+            dtypes (dict, optional): Column names mapped to NumPy dtypes, datetime64 dtypes read date serial numbers and integer dtypes
+                require a whole number in every cell, ValueError is raised otherwise. Inferred by default.
+            kind (str, optional): A choice between ['pandas', 'numpy'], pandas by default.
+        Returns:
+            pandas.DataFrame: Data stored in sheet's specified range.
+            collections.OrderedDict: Column names mapped to NumPy arrays when kind is 'numpy'.
+        """
+        from pygsheet.frames import rows_to_columns, to_frame
+        response = self.execute(self.service.spreadsheets().values().get(spreadsheetId=self.spreadsheetId,
+            range=self.format_range(sheet, sheet_range), valueRenderOption='UNFORMATTED_VALUE'))
+        names, columns = rows_to_columns(response.get('values', []), header, dtypes)
+        return to_frame(names, columns, kind)
+
+    def read_grid(self, sheet, sheet_range=None):
+        """This function reads a range into a CompactGrid, which stores values column-wise in typed arrays
+        with a shared table for repeated text, using a fraction of the memory of read_data_in_range lists.
+        Args:
+            sheet (str): Sheet name.
+            sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`, optional): A tuple with two coordinates which delimitate a sheet range for read, all sheet by default.
+            sheet_range (str, optional): Another implementation of sheet range which suports excel range format, all sheet by default.
+        Returns:
+            CompactGrid: Unformatted values of the range, ragged rows padded with empty strings.
+        """
+        response = self.execute(self.service.spreadsheets().values().get(spreadsheetId=self.spreadsheetId,
+            range=self.format_range(sheet, sheet_range), valueRenderOption='UNFORMATTED_VALUE'))
+        return CompactGrid.from_rows(response.pop('values', []))
+
+    def iter_rows(self, sheet, batch_rows=1000, prefetch=1, omit_empty=False, value_render='UNFORMATTED_VALUE'):
+        """This function iterates over the rows of a sheet reading it in windows of rows, so memory stays bounded by the window size
+        Args:
+            sheet (str): Sheet name.
+            batch_rows (int, optional): Number of rows fetched in each request.
+            prefetch (int, optional): Number of windows fetched in background while the current one is consumed.
+            omit_empty (bool, optional): True if you want to skip empty rows.
+            value_render (str, optional): A choice between ['UNFORMATTED_VALUE', 'FORMATTED_VALUE', 'FORMULA'], UNFORMATTED_VALUE by default.
+        Yields:
+            list: Values of each row, trailing empty rows are not yielded.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        # the row count is reloaded, appends grow the sheet past the cached one
+        self.get_sheets_id(sheet, refresh=True)
+        row_count = self.sheets_properties.get(sheet, {}).get("gridProperties", {}).get("rowCount")
+        starts = iter(range(1, row_count + 1, batch_rows)) if row_count else count(1, batch_rows)
+        executor = ThreadPoolExecutor(max_workers=1)
+        pending = deque()
+
+        def submit():
+            start = next(starts, None)
+            if start is None:
+                return
+            end = min(start + batch_rows - 1, row_count) if row_count else start + batch_rows - 1
+            request = self.service.spreadsheets().values().get(spreadsheetId=self.spreadsheetId,
+                range=self.format_range(sheet, '{}:{}'.format(start, end)), valueRenderOption=value_render)
+            pending.append((end - start + 1, executor.submit(lambda: self.execute(request))))
+
+        try:
+            for i in range(prefetch + 1):
+                submit()
+            blank = 0
+            while pending:
+                size, future = pending.popleft()
+                rows = future.result().get('values', [])
+                if not row_count and not rows:
+                    break
+                submit()
+                for row in rows:
+                    if not row:
+                        blank += 1
+                        continue
+                    if not omit_empty:
+                        for i in range(blank):
+                            yield []
+                    blank = 0
+                    yield row
+                blank += size - len(rows)
+        finally:
+            for size, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def read_ranges(self, ranges, omit_empty=False, spreadsheet_id=None):
+        """This function reads several ranges, even from different sheets, in a single request
+        Args:
+            ranges (list): Sheet names or (sheet, sheet_range) tuples, where sheet_range is a coordinates tuple or an excel range.
+            omit_empty (bool, optional): True if you want to retrieve empty cells as None.
+            spreadsheet_id (str, optional): id of another spreadsheet read with the credentials of this manager, this one by default.
+        Returns:
+            dict: Data stored in every range, keyed by the requested range.
+        """
+        ranges = list(ranges)
+        formated = [self.format_range(item, None) if isinstance(item, str) else self.format_range(*item) for item in ranges]
+        if not formated:
+            return {}
+        response = self.execute(self.service.spreadsheets().values().batchGet(spreadsheetId=spreadsheet_id or self.spreadsheetId,
+            ranges=formated, valueRenderOption='UNFORMATTED_VALUE'))
+        return {item: self.process_values(value_range, omit_empty) for item, value_range in zip(ranges, response.get('valueRanges', []))}
+
+    @staticmethod
+    def process_values(value_range, omit_empty=False):
+        """This function flattens the rows of an API ValueRange as read_data_in_range returns them
+        Args:
+            value_range (dict): API ValueRange.
+            omit_empty (bool, optional): True if you want to skip empty rows.
+        Returns:
+            list: Rows with a single value as scalars and empty rows as None, unless they are omitted.
+        """
+        if 'values' in value_range and not omit_empty:
+            return [val[0] if len(val) == 1 else {0: None}.get(len(val), val) for val in value_range['values']]
+        elif 'values' in value_range and omit_empty:
+            return [val[0] if len(val) == 1 else val for val in value_range['values'] if len(val) > 0]
         else:
             return []
 
     def append_data(self, data, sheet, value_input='USER_ENTERED'):
         """This function appends data to a specified sheet
+        Lists and grids are sent in a single request, iterators and generators in chunks of 1000 rows, see append_rows.
         Args:
             data (:obj:`list` of :obj:`tuple` of :obj:`tuple`): data list which we want to write.
+            data (CompactGrid): Another implementation of data, as read_grid returns it.
+            data (iterable): Rows produced on the fly, like a generator.
             sheet (str): Sheet name.
+        Returns:
+            dict: Summary of the append, see append_rows.
         """
 #        if self.with_pipeline:
 #            data_list = []
@@ -112,8 +337,58 @@ class SpreadsheetManager:
 #            }
 #            self.pipeline.append(data)
 #        else:
-        self.service.spreadsheets().values().append(spreadsheetId=self.spreadsheetId,
-                range=sheet, body={'values': data}, valueInputOption=value_input).execute()
+        chunk_rows = max(len(data), 1) if hasattr(data, '__len__') else 1000
+        return self.append_rows(data, sheet, chunk_rows=chunk_rows, value_input=value_input)
+
+    def append_rows(self, rows, sheet, chunk_rows=1000, max_in_flight=2, value_input='USER_ENTERED'):
+        """This function appends rows from any iterable or generator to a sheet, in chunks of fixed size.
+        Chunks are serialized while previous ones are being sent, at most max_in_flight chunks are held at once
+        and they are appended one after another so rows keep their order.
+        Args:
+            rows (iterable): Rows which we want to append, each one an iterable of values. A CompactGrid is decoded row by row.
+            sheet (str): Sheet name.
+            chunk_rows (int, optional): Number of rows sent in each request.
+            max_in_flight (int, optional): Maximum number of serialized chunks waiting to be sent.
+            value_input (str, optional): A choice between ['RAW', 'USER_ENTERED'], USER_ENTERED by default.
+        Returns:
+            dict: Number of 'rows' and 'chunks' sent and the 'ranges' updated by each chunk.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1)
+        pending = deque()
+        summary = {'rows': 0, 'chunks': 0, 'ranges': []}
+
+        def collect(future):
+            response = future.result()
+            summary['ranges'].append(response.get('updates', {}).get('updatedRange'))
+
+        def send(chunk):
+            request = self.service.spreadsheets().values().append(spreadsheetId=self.spreadsheetId,
+                range=self.format_range(sheet, None), body={'values': chunk}, valueInputOption=value_input)
+            if len(pending) >= max_in_flight:
+                collect(pending.popleft())
+            pending.append(executor.submit(lambda: self.execute(request)))
+            summary['rows'] += len(chunk)
+            summary['chunks'] += 1
+
+        try:
+            chunk = []
+            for row in rows:
+                chunk.append(list(row))
+                if len(chunk) >= chunk_rows:
+                    send(chunk)
+                    chunk = []
+            if chunk:
+                send(chunk)
+            while pending:
+                collect(pending.popleft())
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+            # appends grow the sheet, the cached row count is stale
+            self.metadata_time = None
+        return summary
 
     def delete_data(self, sheet, sheet_range=None):
         """This function delete a specified range from a sheet
@@ -122,10 +397,10 @@ class SpreadsheetManager:
             sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`, optional): A tuple with two coordinates which delimitate a sheet range for delete it, all sheet by default.
             sheet_range (str, optional): Another implementation of sheet range which suports excel range format, all sheet by default.
         """
-        self.service.spreadsheets().values().clear(spreadsheetId=self.spreadsheetId,
-            range=self.format_range(sheet, sheet_range), body={}).execute()
+        self.execute(self.service.spreadsheets().values().clear(spreadsheetId=self.spreadsheetId,
+            range=self.format_range(sheet, sheet_range), body={}), idempotent=True)
 
-    def update_borders(self, sheet, style, width, color=name_to_rgb('black'), alpha=None, sheet_range=None, top=True, bottom=True, left=True, right=True, inner_horizontal=True, inner_vertical=True):
+    def update_borders(self, sheet, style, width, color='black', alpha=None, sheet_range=None, top=True, bottom=True, left=True, right=True, inner_horizontal=True, inner_vertical=True):
         """This function changes borders style of a specified range
         Args:
             sheet (str): Sheet name.
@@ -139,111 +414,14 @@ class SpreadsheetManager:
             bottom(bool, optional): True in case you want to modify a cell's bottom, otherwise False. True by default.
             inner_horizontal(bool, optional): True in case you want to modify a cell's inner_horizontal, otherwise False. True by default.
         """
-        sheet_id = self.get_sheets_id(sheet)
-        range_points = sheet_range if type(sheet_range, tuple) else self.get_range_points(sheet_range)
-        data = {
-            "updateBorders": {
-                "range": {
-                    "sheetId": sheet_id,
-                }
-            }
-        }
-
-        if range_points[0][0]:
-            data["updateBorders"]["range"]["startColumnIndex"] = range_points[0][0]
-
-        if range_points[0][1]:
-            data["updateBorders"]["range"]["startRowIndex"] = range_points[0][0] + 1
-
-        if range_points[1][0]:
-            data["updateBorders"]["range"]["endColumnIndex"] = range_points[1][0]
-
-        if range_points[1][1]:
-            data["updateBorders"]["range"]["endRowIndex"] = range_points[1][0] + 1
-
-        if top:
-            data["updateBorders"]["top"] = {
-                    "color": {
-                        "red": color[0],
-                        "green": color[1],
-                        "blue": color[2]
-                    },
-                    "width": width,
-                    "style": style
-                }
-
-            if alpha:
-                 data["updateBorders"]["top"]["color"]["alpha"] = alpha
-
-        if bottom:
-            data["updateBorders"]["bottom"] = {
-                    "color": {
-                        "red": color[0],
-                        "green": color[1],
-                        "blue": color[2]
-                    },
-                    "width": width,
-                    "style": style
-                }
-            if alpha:
-                 data["updateBorders"]["bottom"]["color"]["alpha"] = alpha
-        if left:
-            data["updateBorders"]["left"] = {
-                    "color": {
-                        "red": color[0],
-                        "green": color[1],
-                        "blue": color[2]
-                    },
-                    "width": width,
-                    "style": style
-                }
-            if alpha:
-                 data["updateBorders"]["left"]["color"]["alpha"] = alpha
-
-        if right:
-            data["updateBorders"]["right"] = {
-                    "color": {
-                        "red": color[0],
-                        "green": color[1],
-                        "blue": color[2]
-                    },
-                    "width": width,
-                    "style": style
-                }
-            if alpha:
-                 data["updateBorders"]["right"]["color"]["alpha"] = alpha
-
-
-        if inner_horizontal:
-            data["updateBorders"]["innerHorizontal"] = {
-                    "color": {
-                        "red": color[0],
-                        "green": color[1],
-                        "blue": color[2]
-                    },
-                    "width": width,
-                    "style": style
-                }
-            if alpha:
-                 data["updateBorders"]["innerHorizontal"]["color"]["alpha"] = alpha
-
-        if inner_vertical:
-            data["updateBorders"]["innerVertical"] = {
-                    "color": {
-                        "red": color[0],
-                        "green": color[1],
-                        "blue": color[2]
-                    },
-                    "width": width,
-                    "style": style
-                }
-            if alpha:
-                 data["updateBorders"]["innerVertical"]["color"]["alpha"] = alpha
+        border_format = BorderFormat(style, width, color=color, alpha=alpha, top=top, bottom=bottom, left=left, right=right,
+            inner_horizontal=inner_horizontal, inner_vertical=inner_vertical)
+        data = border_format.get_request(self.get_grid_range(sheet, sheet_range))
 
         if self.with_pipeline:
-            self.pipeline.append(data)
+            self.pipeline.append(("batchUpdate", data))
         else:
-            self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)).execute()
+            self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)))
 
     def create_spreadsheet(self, title):
         """This function creates a new spreadsheet and asign it to current 'spreadsheetless' class for futher work.
@@ -257,7 +435,7 @@ class SpreadsheetManager:
                 "timeZone": 'GMT+01:00'
                 }
         }
-        request = self.service.spreadsheets().create(body=data).execute()
+        request = self.execute(self.service.spreadsheets().create(body=data))
         self.spreadsheetId = request["spreadsheetId"]
         return self.spreadsheetId
 
@@ -301,14 +479,14 @@ class SpreadsheetManager:
                 "alpha": 0.9
             }
 
-        sheet_id = sorted([sheet["properties"]["sheetId"] for sheet in self.service.spreadsheets().get(spreadsheetId=self.spreadsheetId).execute()["sheets"]])[-1] + 1
+        sheet_id = max(list(self.get_sheets_id().values()) or [-1]) + 1
         data["addSheet"]["properties"]["sheetId"] = sheet_id
         if self.with_pipeline:
-            self.pipeline.append(data)
+            self.pipeline.append(("batchUpdate", data))
         else:
-            response = self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)).execute()
-            if response:  # TODO: test it
-                self.sheets_id[title] = sheet_id
+            self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)))
+        self.sheets_id[title] = sheet_id
+        self.sheets_properties[title] = data["addSheet"]["properties"]
 
     def delete_sheet(self, sheet):
         data = {
@@ -319,9 +497,11 @@ class SpreadsheetManager:
         if self.with_pipeline:
             self.pipeline.append(("batchUpdate", data))
         else:
-            self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)).execute()
+            self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)))
+        self.sheets_id.pop(sheet, None)
+        self.sheets_properties.pop(sheet, None)
         
-    def cell_format(self, sheet, number_format=None, background=name_to_rgb('white'), h_alignment=None, v_alignment=None, top_padding=None, right_padding=None, bottom_padding=None, left_padding=None, sheet_range=None):
+    def cell_format(self, sheet, number_format=None, background='white', h_alignment=None, v_alignment=None, top_padding=None, right_padding=None, bottom_padding=None, left_padding=None, sheet_range=None):
         """This function changes cell's format
         Args:
             sheet (str): Sheet name.
@@ -335,71 +515,16 @@ class SpreadsheetManager:
             sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`, optional): A tuple with two coordinates which delimitate a sheet range for delete it, all sheet by default.
             sheet_range (str, optional): Another implementation of sheet range which suports excel range format, all sheet by default.
         """
-        sheet_id = self.get_sheets_id(sheet)
-        range_points = sheet_range if isinstance(sheet_range, tuple) else self.get_range_points(sheet_range)
-
-        data = {
-            "UpdateCellsRequest": {
-                "rows": [],
-                "range": {"sheetId": sheet_id},
-            }
-        }
-
-        if range_points[0][0]:
-            data["UpdateCellsRequest"]["range"]["startColumnIndex"] = range_points[0][0]
-
-        if range_points[0][1]:
-            data["UpdateCellsRequest"]["range"]["startRowIndex"] = range_points[0][0] + 1
-
-        if range_points[1][0]:
-            data["UpdateCellsRequest"]["range"]["endColumnIndex"] = range_points[1][0]
-
-        if range_points[1][1]:
-            data["UpdateCellsRequest"]["range"]["endRowIndex"] = range_points[1][0] + 1
-
-        n_rows = range_points[1][1] - range_points[0][1] if range_points[1][1] and range_points[0][1] else 1
-        n_cols = range_points[1][0] - range_points[0][0] if range_points[1][0] and range_points[0][0] else 1
-
-        for i in range(n_rows):
-            row_data = {"values": []}
-
-            for j in range(n_cols):
-                cell_data = {
-                    "userEnteredFormat": {}
-                }
-                if number_format:
-                    cell_data["userEnteredFormat"]["numberFormat"]["type"] = number_format
-
-                if background:
-                    cell_data["userEnteredFormat"]["backgroundColor"] = {
-                        "red": background[0],
-                        "green": background[1],
-                        "blue": background[2]
-                    }
-                if top_padding:
-                    cell_data["userEnteredFormat"]["padding"]["top"] = top_padding
-                if right_padding:
-                    cell_data["userEnteredFormat"]["padding"]["right"] = right_padding
-                if bottom_padding:
-                    cell_data["userEnteredFormat"]["padding"]["bottom"] = bottom_padding
-                if left_padding:
-                    cell_data["userEnteredFormat"]["padding"]["left"] = left_padding
-                if h_alignment:
-                    cell_data["userEnteredFormat"]["padding"]["horizontalAlignment"] = h_alignment
-                if v_alignment:
-                    cell_data["userEnteredFormat"]["padding"]["verticalAlignment"] = v_alignment
-
-                row_data["values"].append(cell_data)
-
-            data["UpdateCellsRequest"]["rows"].append(row_data)
+        cell_format = CellFormat(background=background, h_alignment=h_alignment, v_alignment=v_alignment, top_padding=top_padding,
+            right_padding=right_padding, bottom_padding=bottom_padding, left_padding=left_padding, number_format=number_format)
+        data = cell_format.get_request(self.get_grid_range(sheet, sheet_range))
 
         if self.with_pipeline:
             self.pipeline.append(("batchUpdate", data))
         else:
-            self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)).execute()
-
+            self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)))
 
-    def text_format(self, sheet, color=name_to_rgb('black'), sheet_range=None, font='Comic Sans MS', size=None, bold=False, italic=False):
+    def text_format(self, sheet, color='black', sheet_range=None, font='Comic Sans MS', size=None, bold=False, italic=False):
         """This function changes text's format
         Args:
             sheet (str): Sheet name.
@@ -412,62 +537,13 @@ class SpreadsheetManager:
             bold (bool, optional): True if you want to bold it. False as default.
             italic (bool, optional): True if you want to italic it. False as default.
         """
-        sheet_id = self.get_sheets_id(sheet)
-        range_points = sheet_range if type(sheet_range, tuple) else self.get_range_points(sheet_range)
-
-        data = {
-            "UpdateCellsRequest": {
-                "rows": [],
-                "range": {"sheetId": sheet_id},
-            }
-        }
-
-        if range_points[0][0]:
-            data["UpdateCellsRequest"]["range"]["startColumnIndex"] = range_points[0][0]
-
-        if range_points[0][1]:
-            data["UpdateCellsRequest"]["range"]["startRowIndex"] = range_points[0][0] + 1
-
-        if range_points[1][0]:
-            data["UpdateCellsRequest"]["range"]["endColumnIndex"] = range_points[1][0]
-
-        if range_points[1][1]:
-            data["UpdateCellsRequest"]["range"]["endRowIndex"] = range_points[1][0] + 1
-
-        n_rows = range_points[1][1] - range_points[0][1] if range_points[1][1] and range_points[0][1] else 1
-        n_cols = range_points[1][0] - range_points[0][0] if range_points[1][0] and range_points[0][0] else 1
-
-        for i in range(n_rows):
-            row_data = {"values": []}
-
-            for j in range(n_cols):
-                cell_data = {
-                    "userEnteredFormat": {"textFormat": {}}
-                }
-                if color:
-                    cell_data["userEnteredFormat"]["textFormat"]["foregroundColor"] = {
-                        "red": color[0],
-                        "green": color[1],
-                        "blue": color[2]
-                    }
-                if font:
-                     cell_data["userEnteredFormat"]["textFormat"]["fontFamily"] = font
-                if size:
-                    cell_data["userEnteredFormat"]["textFormat"]["fontSize"] = size
-                if bold:
-                    cell_data["userEnteredFormat"]["textFormat"]["bold"] = bold
-                if italic:
-                    cell_data["userEnteredFormat"]["textFormat"]["italic"] = italic
-
-
-                row_data["values"].append(cell_data)
-
-            data["UpdateCellsRequest"]["rows"].append(row_data)
+        text_format = TextFormat(color=color, font=font, size=size, bold=bold, italic=italic)
+        data = text_format.get_request(self.get_grid_range(sheet, sheet_range))
 
         if self.with_pipeline:
             self.pipeline.append(("batchUpdate", data))
         else:
-            self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)).execute()
+            self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)))
 
     def filter_view(self, sheet, id, title, condition_type, condition, sort_order=None, sheet_range=None):
         """
@@ -518,8 +594,32 @@ class SpreadsheetManager:
             gradient_format_class (GradientFormat, optional): Gets a gradient format class for use it in conditional formating.
             sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`, optional): A tuple with two coordinates which delimitate a sheet range for delete it, all sheet by default.
             sheet_range (str, optional): Another implementation of sheet range which suports excel range format, all sheet by default.
+            condition (list, optional): Several values, for conditions like NUMBER_BETWEEN. None for conditions without values like BLANK.
         """
-        pass
+        rule = {"ranges": [self.get_grid_range(sheet, sheet_range)]}
+        if gradient_format_class:
+            rule["gradientRule"] = gradient_format_class.get_format()
+        else:
+            values = condition if isinstance(condition, (list, tuple)) else [condition] if condition is not None else []
+            boolean_condition = {"type": condition_type.upper()}
+            if values:
+                boolean_condition["values"] = [{"userEnteredValue": str(value)} for value in values]
+            rule["booleanRule"] = {"condition": boolean_condition, "format": conditional_format_fields(text_format_class, cell_format_class)}
+        data = {"addConditionalFormatRule": {"rule": rule, "index": 0}}
+
+        if self.with_pipeline:
+            self.pipeline.append(("batchUpdate", data))
+        else:
+            self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(data)))
+
+    def format_planner(self):
+        """This function returns a FormatPlanner which groups the formats of this spreadsheet and sends
+        one request for every rectangle of identical formats, when it is executed or its with block ends.
+        Returns:
+            FormatPlanner: Planner bound to this manager.
+        """
+        from pygsheet.styles import FormatPlanner
+        return FormatPlanner(self)
 
 #    def find_and_replace(self, find, replace, sheet_range=None, sheet=None,  case_sensitive=True, entire_cell=True, regrex=False, search_formula=False):
 #        request = {
@@ -549,30 +649,203 @@ class SpreadsheetManager:
 #        else:
 #            self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(request)).execute()
 
-    def get_sheets_id(self, sheet=None):
-        spreadsheet = self.service.spreadsheets().get(spreadsheetId=self.spreadsheetId).execute()
-        sheets_dic = {sheet["properties"]["title"]: sheet["properties"]["sheetId"] for sheet in spreadsheet["sheets"]}
+    def get_sheets_id(self, sheet=None, refresh=False):
+        """This function returns sheet ids from the metadata cache, loading it when it is empty or expired
+        Args:
+            sheet (str, optional): Sheet name, all sheets by default.
+            refresh (bool, optional): True if you want to reload the metadata before lookup.
+        Returns:
+            int: Id of the specified sheet.
+            dict: Sheet names mapped to their ids when no sheet is specified.
+        """
+        expired = self.metadata_ttl is not None and self.metadata_time is not None and time.time() - self.metadata_time > self.metadata_ttl
+        if refresh or expired or self.metadata_time is None or (sheet and sheet not in self.sheets_id):
+            self.refresh_metadata()
         if sheet:
-            return sheets_dic[sheet]
+            return self.sheets_id[sheet]
         else:
-            return sheets_dic
+            return self.sheets_id
 
-#    def export_csv(self, sheet=None, file_name=None):
-#        """This function allow to export a specified sheet as csv
-#        Args:
-#            sheet (str): Sheet name.
-#        """
-#        if file_name:
-#            file = open(file_name + '.csv', 'w')
-#        else:
-#            from datetime import datetime
-#            file = open('pygsheet_export_at_' + str(datetime.now().isoformat))
-#
-#        if sheet:
-#            spreadsheet = [element for element in self.service.spreadsheets().get(spreadsheetId=self.spreadsheetId)["sheets"] if sheet["properties"]["title"] == sheet][0]
-#
-#        else:
+    def refresh_metadata(self):
+        """This function reloads sheet properties, useful when other writers add, rename or delete sheets.
+        Returns:
+            dict: Sheet names mapped to their ids.
+        """
+        spreadsheet = self.execute(self.service.spreadsheets().get(spreadsheetId=self.spreadsheetId, fields='sheets.properties'))
+        self.sheets_properties = {sheet["properties"]["title"]: sheet["properties"] for sheet in spreadsheet.get("sheets", [])}
+        self.sheets_id = {title: properties["sheetId"] for title, properties in self.sheets_properties.items()}
+        self.metadata_time = time.time()
+        return self.sheets_id
+
+    def export_csv(self, sheet, file_name=None, batch_rows=1000, value_render='FORMATTED_VALUE'):
+        """This function exports a sheet as csv, streaming it in windows of rows so memory does not grow with the sheet
+        Args:
+            sheet (str): Sheet name.
+            file_name (str, optional): Path of the file, .csv is added when it is missing. pygsheet_export_at_<timestamp>.csv by default.
+            batch_rows (int, optional): Number of rows fetched in each request.
+            value_render (str, optional): A choice between ['FORMATTED_VALUE', 'UNFORMATTED_VALUE', 'FORMULA'], FORMATTED_VALUE by default.
+        Returns:
+            str: Path of the file.
+        """
+        if not file_name:
+            from datetime import datetime
+            file_name = 'pygsheet_export_at_' + datetime.now().strftime('%Y%m%dT%H%M%S')
+        file_name = file_name if file_name.endswith('.csv') else file_name + '.csv'
+        self.export_sheet(sheet, file_name, 'csv', batch_rows=batch_rows, value_render=value_render)
+        return file_name
+
+    def export_sheet(self, sheet, path, fmt='csv', batch_rows=1000, header=True, value_render='UNFORMATTED_VALUE'):
+        """This function streams a sheet into a CSV, Parquet or Arrow file, Parquet and Arrow require pyarrow
+        Args:
+            sheet (str): Sheet name.
+            path (str): Path of the file.
+            fmt (str, optional): A choice between ['csv', 'parquet', 'arrow'], csv by default.
+            batch_rows (int, optional): Number of rows fetched in each request and written in each record batch.
+            header (bool, optional): True if the first row holds column names, typed formats infer column types from the first window.
+            value_render (str, optional): A choice between ['UNFORMATTED_VALUE', 'FORMATTED_VALUE', 'FORMULA'], UNFORMATTED_VALUE by default.
+        Returns:
+            int: Number of rows written.
+        """
+        from pygsheet.export import export_rows
+        return export_rows(self.iter_rows(sheet, batch_rows=batch_rows, value_render=value_render), path, fmt, header, batch_rows)
 
+    def export_all(self, directory='.', fmt='csv', max_workers=4, batch_rows=1000, header=True, value_render='UNFORMATTED_VALUE'):
+        """This function exports every sheet of the spreadsheet at once, each one streamed by a worker of a pool
+        Args:
+            directory (str, optional): Directory of the files, named after the sheets, with the sheet index appended to names
+                which would collide. The current one by default.
+            fmt (str, optional): A choice between ['csv', 'parquet', 'arrow'], csv by default.
+            max_workers (int, optional): Maximum number of sheets exported at the same time.
+            batch_rows (int, optional): Number of rows fetched in each request.
+            header (bool, optional): True if the first row of every sheet holds column names.
+            value_render (str, optional): A choice between ['UNFORMATTED_VALUE', 'FORMATTED_VALUE', 'FORMULA'], UNFORMATTED_VALUE by default.
+        Returns:
+            dict: For every sheet name, the 'path' of its file, the number of 'rows' written and the 'error' raised, if any.
+        """
+        import os
+        from concurrent.futures import ThreadPoolExecutor
+        from pygsheet.export import export_file_names
+
+        def export(sheet, file_name):
+            result = {'path': os.path.join(directory, file_name), 'rows': 0, 'error': None}
+            try:
+                result['rows'] = self.export_sheet(sheet, result['path'], fmt, batch_rows, header, value_render)
+            except Exception as error:
+                result['error'] = error
+            return result
+
+        sheets = list(self.get_sheets_id())
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(sheets, executor.map(export, sheets, export_file_names(sheets, fmt))))
+
+    def import_file(self, path, sheet, start=(1, 1), method='auto', delimiter=None, chunk_bytes=None):
+        """This function imports a CSV, TSV, XLSX or Parquet file letting the server parse it, instead of sending values
+        Delimited text is pasted in chunks with pasteData, spreadsheet files and large delimited files imported into
+        a new sheet are converted by Drive on upload and the converted sheet is copied into this spreadsheet.
+        Args:
+            path (str): Path of the file.
+            sheet (str): Sheet name, it is created when it does not exist.
+            start (:obj: `tuple` of :obj: `int`, optional): (row, column) coordinates of the top left cell, A1 by default.
+            method (str, optional): A choice between ['auto', 'paste', 'drive'], the cheaper one for the file by default.
+            delimiter (str, optional): Delimiter of text files, inferred from the extension by default.
+            chunk_bytes (int, optional): Approximate size of the text pasted in each request.
+        Returns:
+            dict: The 'method' used, number of 'rows' imported, 'requests' sent, 'seconds' taken and 'rows_per_second'.
+        """
+        import os
+        from pygsheet import importer
+        started = time.time()
+        new_sheet = sheet not in self.get_sheets_id()
+        extension = os.path.splitext(path)[1].lower()
+        if method == 'auto':
+            method = importer.choose_import_method(path, new_sheet, tuple(start) == (1, 1))
+        if method == 'drive':
+            if not new_sheet or tuple(start) != (1, 1):
+                raise ValueError('Drive conversion imports into a new sheet from A1 only')
+            summary = self.convert_file(path, sheet)
+        else:
+            delimiter = delimiter or importer.TEXT_FORMATS.get(extension, ',')
+            chunk_bytes = chunk_bytes or importer.PASTE_CHUNK_BYTES
+            if extension == '.parquet':
+                chunks = importer.iter_parquet_chunks(path, chunk_bytes, delimiter)
+            elif extension in importer.TEXT_FORMATS:
+                chunks = importer.iter_text_chunks(path, chunk_bytes, delimiter)
+            else:
+                raise ValueError('{} can not be pasted, use method="drive"'.format(path))
+            summary = self.paste_chunks(chunks, sheet, start, delimiter)
+        summary['method'] = method
+        summary['seconds'] = time.time() - started
+        summary['rows_per_second'] = summary['rows'] / summary['seconds'] if summary['seconds'] else None
+        return summary
+
+    def paste_chunks(self, chunks, sheet, start=(1, 1), delimiter=','):
+        """This function pastes chunks of delimited text one below another, growing the sheet when they do not fit
+        Args:
+            chunks (iterable): (text, number of records, number of columns) tuples.
+            sheet (str): Sheet name, it is created when it does not exist.
+            start (:obj: `tuple` of :obj: `int`, optional): (row, column) coordinates of the top left cell, A1 by default.
+            delimiter (str, optional): Delimiter of the text.
+        Returns:
+            dict: Number of 'rows' pasted and 'requests' sent.
+        """
+        from pygsheet.importer import paste_request
+        if sheet not in self.get_sheets_id():
+            self.create_sheet(sheet, cols=26)
+        sheet_id = self.get_sheets_id(sheet)
+        grid = self.sheets_properties.setdefault(sheet, {}).setdefault("gridProperties", {})
+        row, col = start[0] - 1, start[1] - 1
+        summary = {'rows': 0, 'requests': 0}
+        for text, n_records, width in chunks:
+            requests = []
+            for dimension, key, needed in (("ROWS", "rowCount", row + n_records), ("COLUMNS", "columnCount", col + width)):
+                if needed > grid.get(key, 0):
+                    requests.append({"appendDimension": {"sheetId": sheet_id, "dimension": dimension, "length": needed - grid.get(key, 0)}})
+                    grid[key] = needed
+            requests.append(paste_request(sheet_id, row, col, text, delimiter))
+            self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body={"requests": requests}))
+            row += n_records
+            summary['rows'] += n_records
+            summary['requests'] += 1
+        return summary
+
+    def convert_file(self, path, sheet):
+        """This function uploads a file converting it to a spreadsheet and copies its first sheet into this spreadsheet
+        Args:
+            path (str): Path of a CSV, TSV, XLS or XLSX file.
+            sheet (str): Name of the new sheet.
+        Returns:
+            dict: Number of 'rows' and 'requests' sent, upload retries included. Rows are the records of text files, counted
+                locally, and the grid rows of the converted sheet for spreadsheet files, which may include empty rows.
+        """
+        import os
+        from pygsheet import importer
+        if not self.drive_manager:
+            self.get_drive_manager()
+        drive = self.drive_manager
+        extension = os.path.splitext(path)[1].lower()
+        converted = drive.upload_file(path, importer.DRIVE_FORMATS.get(extension), target_mime=importer.SHEETS_MIME_TYPE)
+        requests = converted['requests']
+        try:
+            spreadsheet = self.execute(self.service.spreadsheets().get(spreadsheetId=converted['id'],
+                fields='sheets.properties(sheetId,gridProperties)'))
+            properties = spreadsheet['sheets'][0]['properties']
+            copied = self.execute(self.service.spreadsheets().sheets().copyTo(spreadsheetId=converted['id'],
+                sheetId=properties['sheetId'], body={'destinationSpreadsheetId': self.spreadsheetId}))
+            self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body={"requests": [
+                {"updateSheetProperties": {"properties": {"sheetId": copied['sheetId'], "title": sheet}, "fields": "title"}}]}))
+            requests += 3
+        finally:
+            drive.execute(drive.service.files().delete(fileId=converted['id'], supportsTeamDrives=True))
+            requests += 1
+        self.refresh_metadata()
+        requests += 1
+        if extension in importer.TEXT_FORMATS:
+            rows = importer.count_records(path, importer.TEXT_FORMATS[extension])
+        else:
+            rows = properties.get('gridProperties', {}).get('rowCount', 0)
+        return {'rows': rows, 'requests': requests}
 
     def share_spreadsheet(self, domain=None, user_list=None):
         """This function allow to share the spreadsheet to users or a domain
@@ -605,75 +878,57 @@ class SpreadsheetManager:
                 
     def get_drive_manager(self):
         from pygsheet import drive_manager
-        self.drive_manager = drive_manager.DriveManager(app_name=self.app_name, cred_path=self.cred_path)
+        self.drive_manager = drive_manager.DriveManager(app_name=self.app_name, cred_path=self.cred_path, scheduler=self.scheduler, session=self.session)
 
-    def get_credentials(self, cred_path, cred_file='client_secret.json'):
-        import os
-        from oauth2client.file import Storage
-        from oauth2client import client
-        if not cred_path:
-            home_dir = os.path.expanduser('~')
-            credential_dir = os.path.join(home_dir, '.credentials')
-            if not os.path.exists(credential_dir):
-                try: 
-                    os.system("sudo mkdir {}".format(credential_dir))
-                except:
-                    os.umask(0)
-                    os.makedirs(credential_dir, mode=0o777)
-        else:
-            credential_dir = cred_path
-        
-        credential_path = os.path.join(credential_dir, 'python-quickstart.json')
-        store = Storage(credential_path)
-        credentials = store.get()
-        if not credentials or credentials.invalid:
-            if cred_path is None:
-                flow = client.flow_from_clientsecrets(cred_file, scope=['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive'])
-            else:
-                flow = client.flow_from_clientsecrets(cred_path + cred_file, scope=['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive'])
-            flow.user_agent = self.app_name
-            try:
-                credentials = tools.run_flow(flow, store, self.flags)
-            except:  # Needed only for compatibility with Python 2.6
-                try:
-                    credentials = tools.run_flow(flow, store)
-                except:
-                    credentials = tools.run(flow, store)
-            print('Storing credentials to ' + credential_path)
-        return credentials
+    def get_credentials(self, cred_path=None, cred_file='client_secret.json'):
+        return self.session.get_credentials()
 
     def get_service(self, cred_path=None):
-        import httplib2
-        from apiclient import discovery
-        credentials = self.get_credentials(cred_path=cred_path)
-        http = credentials.authorize(httplib2.Http())
-        discoveryUrl = ('https://sheets.googleapis.com/$discovery/rest?'
-                        'version=v4')
-        return discovery.build('sheets', 'v4', http=http, discoveryServiceUrl=discoveryUrl)
+        return self.session.get_service('sheets', 'v4')
 
-    def format_range(self, sheet, sheet_range):
-        def excel_style(row, col):
-            LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-            result = []
-            while col:
-                col, rem = divmod(col-1, 26)
-                result[:0] = LETTERS[rem]
-            return ''.join(result) + str(row)
+    def execute(self, request, idempotent=None):
+        """This function executes an API request through the scheduler, on a connection checked out of the session pool
+        Args:
+            request (googleapiclient.http.HttpRequest): Request built from the service.
+            idempotent (bool, optional): True if the request can be retried after server errors, inferred from its HTTP method by default.
+        Returns:
+            dict: Deserialized response.
+        """
+        with self.session.connection() as http:
+            return self.scheduler.execute(request, http=http, idempotent=idempotent)
 
+    def format_range(self, sheet, sheet_range):
         formated = "'" + sheet + "'"
         if sheet_range:
             if isinstance(sheet_range, list):
                 pass
-            elif isinstance(sheet_range, tuple):
-                init = excel_style(sheet_range[0][0], sheet_range[0][1])
-                end = excel_style(sheet_range[1][0], sheet_range[1][1])
-                formated += '!' + init + ':' + end
+            elif isinstance(sheet_range, (tuple, GridRange)):
+                formated += '!' + GridRange.parse(sheet_range).to_a1()
             elif isinstance(sheet_range, str):
                 formated += '!' + sheet_range
         return formated
     
     def get_range_points(self, range):
-        pass  # TODO: finish it
+        """This function converts a range to one based inclusive (row, column) coordinates
+        Args:
+            range (str): A1 or R1C1 notation, or a GridRange. Parsed strings are cached.
+        Returns:
+            tuple: Two (row, column) coordinates, None on unbounded sides like in A:C or 2:5.
+        """
+        return GridRange.parse(range).points()
+
+    def get_grid_range(self, sheet, sheet_range=None):
+        """This function builds the API GridRange of a sheet range
+        Args:
+            sheet (str): Sheet name.
+            sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`, optional): A tuple with two (row, column) coordinates which delimitate a sheet range, all sheet by default.
+            sheet_range (str, optional): Another implementation of sheet range which suports excel range format, all sheet by default.
+        Returns:
+            dict: Zero based and end exclusive GridRange.
+        """
+        if not sheet_range:
+            return {"sheetId": self.get_sheets_id(sheet)}
+        return GridRange.parse(sheet_range).to_dict(self.get_sheets_id(sheet))
 
     def create_request_body(self, data):
         if isinstance(data, list):
@@ -690,20 +945,316 @@ class SpreadsheetManager:
             }
         return body
 
-#    def execute_pipeline(self):
-#        response = self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId, body=self.create_request_body(self.pipeline)).execute()
-#        if response and str(self.pipeline)
-
-
-
-class TextFormat:
-    def __init__(self, color=name_to_rgb('black'), sheet_range=None, font='Comic Sans MS', size=None, bold=False, italic=False):
-        pass
-
-class CellFormat:
-    def __init__(self, background=name_to_rgb('white'), h_alignment=None, v_alignment=None, top_padding=None, right_padding=None, bottom_padding=None, left_padding=None):
-        pass
+    def split_pipeline(self, operations, max_requests=MAX_BATCH_REQUESTS, max_bytes=MAX_BATCH_BYTES):
+        """This function groups buffered operations into batches which can be sent in a single call
+        Args:
+            operations (list): Pipeline entries, ("batchUpdate", request) or ("values", value_range) tuples.
+            max_requests (int, optional): Maximum number of requests in a batch.
+            max_bytes (int, optional): Maximum serialized payload size of a batch.
+        Returns:
+            list: (kind, value_input, entries) tuples, in pipeline order.
+        """
+        batches = []
+        key = None
+        size = 0
+        for operation in operations:
+            if not isinstance(operation, tuple):
+                operation = ("batchUpdate", operation)
+            kind, payload = operation
+            value_input = payload.get("valueInputOption") if kind == "values" else None
+            payload_size = len(json.dumps(payload, separators=(',', ':')))
+            if (kind, value_input) != key or len(batches[-1][2]) >= max_requests or size + payload_size > max_bytes:
+                batches.append((kind, value_input, []))
+                key = (kind, value_input)
+                size = 0
+            batches[-1][2].append(payload)
+            size += payload_size
+        return batches
+
+    def execute_pipeline(self, max_requests=MAX_BATCH_REQUESTS, max_bytes=MAX_BATCH_BYTES, stop_on_error=True):
+        """This function flushes every buffered operation using as few batch calls as possible.
+        Consecutive structural and formatting requests are sent through spreadsheets().batchUpdate and consecutive
+        value writes through values().batchUpdate, so the order of the operations is kept.
+        Args:
+            max_requests (int, optional): Maximum number of requests sent in a single call.
+            max_bytes (int, optional): Maximum serialized payload size sent in a single call.
+            stop_on_error (bool, optional): True if you want to skip every operation after a failed batch. True by default.
+        Returns:
+            list: A dict for every buffered operation, in order, with 'kind', 'request', 'response' and 'error' keys.
+        """
+        operations, self.pipeline = self.pipeline, []
+        results = []
+        failure = None
+        for kind, value_input, batch in self.split_pipeline(operations, max_requests, max_bytes):
+            if failure is not None and stop_on_error:
+                results.extend({"kind": kind, "request": payload, "response": None, "error": "skipped"} for payload in batch)
+                continue
+            try:
+                replies = self.execute_batch(kind, value_input, batch)
+            except Exception as error:
+                failure = error
+                self.metadata_time = None
+                results.extend({"kind": kind, "request": payload, "response": None, "error": error} for payload in batch)
+                continue
+            results.extend({"kind": kind, "request": payload, "response": reply, "error": None} for payload, reply in zip(batch, replies))
+        return results
+
+    def execute_batch(self, kind, value_input, batch):
+        """This function sends a batch built by split_pipeline
+        Args:
+            kind (str): "batchUpdate" for spreadsheets().batchUpdate or "values" for values().batchUpdate.
+            value_input (str): Value input option of a values batch.
+            batch (list): Requests or ValueRanges of the batch.
+        Returns:
+            list: A reply for every element of the batch, in order.
+        """
+        if kind == "values":
+            data = [{k: v for k, v in payload.items() if k != "valueInputOption"} for payload in batch]
+            response = self.execute(self.service.spreadsheets().values().batchUpdate(spreadsheetId=self.spreadsheetId,
+                body={"valueInputOption": value_input, "data": data}), idempotent=True)
+            replies = response.get("responses", [])
+        else:
+            response = self.execute(self.service.spreadsheets().batchUpdate(spreadsheetId=self.spreadsheetId,
+                body=self.create_request_body(batch)))
+            replies = response.get("replies", [])
+        return list(replies) + [None] * (len(batch) - len(replies))
+
+
+
+def rgb_color(color, alpha=None):
+    """This function builds an API color
+    Args:
+        color (:obj: `tuple` of :obj: 'float'): RGB code in 0-1 or 0-255 scale.
+        color (str): color name according web nomenclature.
+        alpha (float, optional): Color transparency.
+    Returns:
+        dict: Color with red, green, blue and optionally alpha keys in 0-1 scale.
+    """
+    if isinstance(color, str):
+        from webcolors import name_to_rgb
+        color = name_to_rgb(color)
+    scale = 255.0 if any(component > 1 for component in color[:3]) else 1.0
+    result = {"red": color[0] / scale, "green": color[1] / scale, "blue": color[2] / scale}
+    if alpha is not None:
+        result["alpha"] = alpha
+    return result
+
+
+def format_fields(user_format, prefix='userEnteredFormat'):
+    """This function computes the fields mask which updates only the given format properties
+    Args:
+        user_format (dict): A CellFormat API object.
+        prefix (str, optional): Path of the format inside CellData.
+    Returns:
+        str: Comma separated list of field paths.
+    """
+    fields = []
+    for key, value in user_format.items():
+        if key in ('textFormat', 'padding') and isinstance(value, dict):
+            fields.append(format_fields(value, prefix + '.' + key))
+        else:
+            fields.append(prefix + '.' + key)
+    return ','.join(field for field in fields if field)
+
+
+def conditional_format_fields(text_format=None, cell_format=None):
+    """This function builds the format of a conditional rule, which only supports bold, italic, strikethrough,
+    foreground and background colors, other properties of the formats are left out
+    Args:
+        text_format (TextFormat, optional): Text format of the matching cells.
+        cell_format (CellFormat, optional): Cell format of the matching cells.
+    Returns:
+        dict: A CellFormat API object.
+    """
+    result = {}
+    if cell_format and "backgroundColor" in cell_format.get_format():
+        result["backgroundColor"] = cell_format.get_format()["backgroundColor"]
+    if text_format:
+        text = text_format.get_format()["textFormat"]
+        text = {key: value for key, value in text.items() if key in ("bold", "italic", "strikethrough", "foregroundColor")}
+        if text:
+            result["textFormat"] = text
+    return result
+
+
+def repeat_cell_request(grid_range, user_format):
+    """This function builds a constant size request which applies the same format to every cell of a range
+    Args:
+        grid_range (dict): API GridRange.
+        user_format (dict): A CellFormat API object.
+    Returns:
+        dict: repeatCell request.
+    """
+    return {
+        "repeatCell": {
+            "range": grid_range,
+            "cell": {"userEnteredFormat": user_format},
+            "fields": format_fields(user_format)
+        }
+    }
+
+
+class Format(object):
+    """Immutable base of the format classes, formats are equal and hash alike when they build the same API format,
+    so they can be interned and grouped by FormatPlanner
+    """
+    __slots__ = ('_key',)
+    mergeable = True
+
+    def __init__(self, **attributes):
+        for name, value in attributes.items():
+            object.__setattr__(self, name, tuple(value) if isinstance(value, list) else value)
+        object.__setattr__(self, '_key', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def get_format(self):
+        return {}
+
+    def key(self):
+        if self._key is None:
+            object.__setattr__(self, '_key', (type(self).__name__, json.dumps(self.get_format(), sort_keys=True)))
+        return self._key
+
+    def __eq__(self, other):
+        return isinstance(other, Format) and self.key() == other.key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+class TextFormat(Format):
+    """Text format which can be applied to ranges or used in conditional formatting
+    """
+    __slots__ = ('color', 'sheet_range', 'font', 'size', 'bold', 'italic')
+
+    def __init__(self, color='black', sheet_range=None, font='Comic Sans MS', size=None, bold=False, italic=False):
+        super(TextFormat, self).__init__(color=color, sheet_range=sheet_range, font=font, size=size, bold=bold, italic=italic)
+
+    def get_format(self):
+        """This function returns the API CellFormat which holds this text format"""
+        text_format = {}
+        if self.color:
+            text_format["foregroundColor"] = rgb_color(self.color)
+        if self.font:
+            text_format["fontFamily"] = self.font
+        if self.size:
+            text_format["fontSize"] = self.size
+        if self.bold:
+            text_format["bold"] = self.bold
+        if self.italic:
+            text_format["italic"] = self.italic
+        return {"textFormat": text_format}
+
+    def get_request(self, grid_range):
+        """This function returns a repeatCell request which applies this format to a GridRange"""
+        return repeat_cell_request(grid_range, self.get_format())
+
+
+class CellFormat(Format):
+    """Cell format which can be applied to ranges or used in conditional formatting
+    """
+    __slots__ = ('background', 'h_alignment', 'v_alignment', 'top_padding', 'right_padding', 'bottom_padding', 'left_padding', 'number_format')
+
+    def __init__(self, background='white', h_alignment=None, v_alignment=None, top_padding=None, right_padding=None, bottom_padding=None, left_padding=None, number_format=None):
+        super(CellFormat, self).__init__(background=background, h_alignment=h_alignment, v_alignment=v_alignment, top_padding=top_padding,
+            right_padding=right_padding, bottom_padding=bottom_padding, left_padding=left_padding, number_format=number_format)
+
+    def get_format(self):
+        """This function returns the API CellFormat of this format"""
+        cell_format = {}
+        if self.number_format:
+            cell_format["numberFormat"] = {"type": self.number_format}
+        if self.background:
+            cell_format["backgroundColor"] = rgb_color(self.background)
+        padding = {}
+        if self.top_padding:
+            padding["top"] = self.top_padding
+        if self.right_padding:
+            padding["right"] = self.right_padding
+        if self.bottom_padding:
+            padding["bottom"] = self.bottom_padding
+        if self.left_padding:
+            padding["left"] = self.left_padding
+        if padding:
+            cell_format["padding"] = padding
+        if self.h_alignment:
+            cell_format["horizontalAlignment"] = self.h_alignment.upper()
+        if self.v_alignment:
+            cell_format["verticalAlignment"] = self.v_alignment.upper()
+        return cell_format
+
+    def get_request(self, grid_range):
+        """This function returns a repeatCell request which applies this format to a GridRange"""
+        return repeat_cell_request(grid_range, self.get_format())
+
+
+class BorderFormat(Format):
+    """Border format of the outer and inner edges of ranges
+    """
+    __slots__ = ('style', 'width', 'color', 'alpha', 'top', 'bottom', 'left', 'right', 'inner_horizontal', 'inner_vertical')
+
+    def __init__(self, style, width, color='black', alpha=None, top=True, bottom=True, left=True, right=True, inner_horizontal=True, inner_vertical=True):
+        super(BorderFormat, self).__init__(style=style, width=width, color=color, alpha=alpha, top=top, bottom=bottom, left=left, right=right,
+            inner_horizontal=inner_horizontal, inner_vertical=inner_vertical)
+
+    @property
+    def mergeable(self):
+        """Adjacent ranges can only be merged when every edge gets the same border, otherwise their shared edge would change"""
+        return all([self.top, self.bottom, self.left, self.right, self.inner_horizontal, self.inner_vertical])
+
+    def get_format(self):
+        """This function returns the API borders of every selected edge"""
+        border = {"color": rgb_color(self.color, self.alpha), "width": self.width, "style": self.style}
+        edges = (("top", self.top), ("bottom", self.bottom), ("left", self.left), ("right", self.right),
+                 ("innerHorizontal", self.inner_horizontal), ("innerVertical", self.inner_vertical))
+        return {edge: dict(border) for edge, selected in edges if selected}
+
+    def get_request(self, grid_range):
+        """This function returns an updateBorders request which applies this format to a GridRange"""
+        data = {"range": grid_range}
+        data.update(self.get_format())
+        return {"updateBorders": data}
+
+
+class GradientFormat(Format):
+    """Color scale of a conditional format, cells get a color interpolated between two or three points
+    """
+    __slots__ = ('init', 'mid', 'end', 'init_col', 'mid_col', 'end_col', 'interpolation_type')
 
-class GradientFormat:
     def __init__(self, init, mid, end, init_col, mid_col, end_col, interpolation_type):
-        pass
+        """Class parameters
+        Args:
+            init (str or number): Value of the minimum point, ignored when its type is MIN.
+            mid (str or number): Value of the middle point, None for a two points scale.
+            end (str or number): Value of the maximum point, ignored when its type is MAX.
+            init_col, mid_col, end_col (:obj: `tuple` of :obj: 'float' or str): Colors of each point.
+            interpolation_type (str or tuple): A choice between ['MIN', 'MAX', 'NUMBER', 'PERCENT', 'PERCENTILE'], or one for each point,
+                two for a two points scale.
+        """
+        super(GradientFormat, self).__init__(init=init, mid=mid, end=end, init_col=init_col, mid_col=mid_col, end_col=end_col,
+            interpolation_type=interpolation_type)
+
+    def get_format(self):
+        """This function returns the API GradientRule of this color scale"""
+        types = self.interpolation_type
+        types = [types.upper()] * 3 if isinstance(types, str) else [value.upper() for value in types]
+        if len(types) == 2:
+            if self.mid is not None:
+                raise ValueError('A three points scale needs three interpolation types')
+            types = [types[0], None, types[1]]
+        rule = {}
+        for name, value, color, point_type in (("minpoint", self.init, self.init_col, types[0]),
+                                               ("midpoint", self.mid, self.mid_col, types[1]),
+                                               ("maxpoint", self.end, self.end_col, types[2])):
+            if name == "midpoint" and value is None:
+                continue
+            point = {"color": rgb_color(color), "type": point_type}
+            if point_type not in ("MIN", "MAX"):
+                point["value"] = str(value)
+            rule[name] = point
+        return rule
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+import re
+
+from functools import lru_cache
+
+A1_PATTERN = re.compile(r"^(?:(?P<sheet>'(?:[^']|'')+'|[^'!]+)!)?(?P<c1>[A-Za-z]*)(?P<r1>\d*)(?:(?<=[A-Za-z\d]):(?=[A-Za-z\d])(?P<c2>[A-Za-z]*)(?P<r2>\d*))?$")
+R1C1_PATTERN = re.compile(r"^(?:(?P<sheet>'(?:[^']|'')+'|[^'!]+)!)?[Rr](?P<r1>\d+)[Cc](?P<c1>\d+)(?::[Rr](?P<r2>\d+)[Cc](?P<c2>\d+))?$")
+
+
+@lru_cache(maxsize=None)
+def column_letter(index):
+    """This function returns the letters of a zero based column index, 0 is A and 26 is AA"""
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+@lru_cache(maxsize=None)
+def column_index(letters):
+    """This function returns the zero based index of column letters, A is 0 and AA is 26"""
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+class GridRange(object):
+    """Immutable sheet range with zero based, end exclusive bounds as the API GridRange.
+    Unbounded sides, like in A:B or 1:3, are None.
+    """
+    __slots__ = ('sheet', 'start_row', 'end_row', 'start_col', 'end_col')
+
+    def __init__(self, sheet=None, start_row=None, end_row=None, start_col=None, end_col=None):
+        object.__setattr__(self, 'sheet', sheet)
+        object.__setattr__(self, 'start_row', start_row)
+        object.__setattr__(self, 'end_row', end_row)
+        object.__setattr__(self, 'start_col', start_col)
+        object.__setattr__(self, 'end_col', end_col)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('GridRange is immutable')
+
+    def __eq__(self, other):
+        return isinstance(other, GridRange) and self.key() == other.key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return 'GridRange({!r}, {!r}, {!r}, {!r}, {!r})'.format(*self.key())
+
+    def key(self):
+        return (self.sheet, self.start_row, self.end_row, self.start_col, self.end_col)
+
+    @classmethod
+    def parse(cls, sheet_range, sheet=None):
+        """This function converts a range in any supported notation
+        Args:
+            sheet_range (str): A1 (B2:C10, A:C, 2:5, 'Sheet'!A1) or R1C1 (R2C2:R10C3) notation.
+            sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`): Two one based (row, column) coordinates, or a single one.
+            sheet_range (GridRange): Returned as it is, with the given sheet.
+            sheet (str, optional): Sheet name, when the range does not include it.
+        Returns:
+            GridRange: Parsed range, conversions of strings are cached.
+        """
+        if isinstance(sheet_range, GridRange):
+            grid_range = sheet_range
+        elif isinstance(sheet_range, tuple):
+            grid_range = parse_points(sheet_range)
+        else:
+            grid_range = parse_string(sheet_range)
+        if sheet is not None and grid_range.sheet is None:
+            grid_range = GridRange(sheet, grid_range.start_row, grid_range.end_row, grid_range.start_col, grid_range.end_col)
+        return grid_range
+
+    @property
+    def n_rows(self):
+        return None if self.start_row is None or self.end_row is None else self.end_row - self.start_row
+
+    @property
+    def n_cols(self):
+        return None if self.start_col is None or self.end_col is None else self.end_col - self.start_col
+
+    def points(self):
+        """This function returns two one based inclusive (row, column) coordinates, None on unbounded sides"""
+        return ((None if self.start_row is None else self.start_row + 1, None if self.start_col is None else self.start_col + 1),
+                (self.end_row, self.end_col))
+
+    def to_dict(self, sheet_id=None):
+        """This function returns the API GridRange
+        Args:
+            sheet_id (int, optional): Id of the sheet.
+        Returns:
+            dict: GridRange with the bounded sides only.
+        """
+        grid_range = {} if sheet_id is None else {"sheetId": sheet_id}
+        if self.start_row is not None:
+            grid_range["startRowIndex"] = self.start_row
+        if self.end_row is not None:
+            grid_range["endRowIndex"] = self.end_row
+        if self.start_col is not None:
+            grid_range["startColumnIndex"] = self.start_col
+        if self.end_col is not None:
+            grid_range["endColumnIndex"] = self.end_col
+        return grid_range
+
+    def to_a1(self, with_sheet=False):
+        """This function returns the range in A1 notation
+        Args:
+            with_sheet (bool, optional): True if you want the quoted sheet name as prefix.
+        Returns:
+            str: A1 range, empty for a whole sheet.
+        """
+        start = (column_letter(self.start_col) if self.start_col is not None else '') + (str(self.start_row + 1) if self.start_row is not None else '')
+        end = (column_letter(self.end_col - 1) if self.end_col is not None else '') + (str(self.end_row) if self.end_row is not None else '')
+        a1 = start if start == end and self.n_rows == 1 and self.n_cols == 1 else start + ':' + end
+        a1 = '' if a1 == ':' else a1
+        if with_sheet and self.sheet is not None:
+            sheet = "'" + self.sheet.replace("'", "''") + "'"
+            return sheet + '!' + a1 if a1 else sheet
+        return a1
+
+
+def parse_points(points):
+    if not isinstance(points[0], tuple):
+        points = (points, points)
+    (start_row, start_col), (end_row, end_col) = points
+    return GridRange(None, start_row - 1 if start_row else None, end_row or None, start_col - 1 if start_col else None, end_col or None)
+
+
+@lru_cache(maxsize=4096)
+def parse_string(sheet_range):
+    match = R1C1_PATTERN.match(sheet_range)
+    if match:
+        r1, c1 = int(match.group('r1')), int(match.group('c1'))
+        r2, c2 = int(match.group('r2') or r1), int(match.group('c2') or c1)
+        return GridRange(unquote(match.group('sheet')), r1 - 1, r2, c1 - 1, c2)
+    match = A1_PATTERN.match(sheet_range)
+    if not match:
+        raise ValueError('Invalid range: {}'.format(sheet_range))
+    c1, r1, c2, r2 = match.group('c1', 'r1', 'c2', 'r2')
+    if c2 is None:
+        c2, r2 = c1, r1
+    return GridRange(unquote(match.group('sheet')),
+                     int(r1) - 1 if r1 else None, int(r2) if r2 else None,
+                     column_index(c1) if c1 else None, column_index(c2) + 1 if c2 else None)
+
+
+def unquote(sheet):
+    if sheet and sheet.startswith("'"):
+        return sheet[1:-1].replace("''", "'")
+    return sheet
+
+
+def parse_ranges(ranges, sheet=None):
+    """This function converts many ranges at once, repeated strings are parsed only once
+    Args:
+        ranges (iterable): Ranges in any notation supported by GridRange.parse.
+        sheet (str, optional): Sheet name, when the ranges do not include it.
+    Returns:
+        list: GridRange objects.
+    """
+    return [GridRange.parse(sheet_range, sheet) for sheet_range in ranges]
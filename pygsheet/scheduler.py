@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+import random
+import socket
+import threading
+import time
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE')
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a request can not be completed before the scheduler deadline"""
+    pass
+
+
+class TokenBucket:
+    """Thread safe token bucket which refills at a per minute rate
+    """
+    def __init__(self, per_minute, capacity=None):
+        """Class parameters
+        Args:
+            per_minute (float): Number of tokens added every minute.
+            capacity (float, optional): Maximum number of stored tokens, a minute worth of tokens by default.
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.time()
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline=None, tokens=1):
+        """This function takes tokens, waiting for them when the bucket does not hold enough
+        Args:
+            deadline (float, optional): Timestamp after which waiting is aborted.
+            tokens (int, optional): Number of tokens, at most the capacity of the bucket is taken.
+        Returns:
+            float: Seconds waited.
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.time()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait = (tokens - self.tokens) / self.rate
+            if deadline is not None and time.time() + wait > deadline:
+                raise SchedulerTimeout('Quota not available before deadline')
+            time.sleep(wait)
+            waited += wait
+
+
+class RequestScheduler:
+    """Central point which throttles API calls with per minute quotas and retries them with exponential
+    backoff and jitter. Sheets calls use the read and write quotas and Drive calls their own one, every request
+    of a Drive HTTP batch is charged. Idempotent calls are retried on 429, 5xx responses and dropped connections,
+    other calls only on 429, since the server may have applied them before failing.
+    """
+    def __init__(self, reads_per_minute=60, writes_per_minute=60, max_retries=6, backoff=1.0, max_backoff=64.0, deadline=300.0,
+                 drive_per_minute=12000, retry_writes=False):
+        """Class parameters
+        Args:
+            reads_per_minute (float, optional): Sheets read quota, 60 by default as the Sheets per user quota.
+            writes_per_minute (float, optional): Sheets write quota, 60 by default as the Sheets per user quota.
+            max_retries (int, optional): Maximum number of retries of a request.
+            backoff (float, optional): Seconds waited before the first retry, doubled on every retry.
+            max_backoff (float, optional): Maximum seconds waited before a retry.
+            deadline (float, optional): Seconds after which a request is given up, never by default if None.
+            drive_per_minute (float, optional): Drive quota, 12000 by default as the Drive per user quota.
+            retry_writes (bool, optional): True if you want to retry every call on 5xx responses and dropped connections,
+                even those which are not idempotent, like appends, copies and permissions.
+        """
+        self.buckets = {'read': TokenBucket(reads_per_minute), 'write': TokenBucket(writes_per_minute),
+                        'drive': TokenBucket(drive_per_minute)}
+        self.retry_writes = retry_writes
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.stats = {'calls': 0, 'throttled': 0, 'retried': 0, 'failed': 0}
+        self.lock = threading.Lock()
+
+    def count(self, counter):
+        with self.lock:
+            self.stats[counter] += 1
+
+    def execute(self, request, http=None, kind=None, idempotent=None):
+        """This function executes a request once quota is available, retrying it on transient errors
+        Args:
+            request (googleapiclient.http.HttpRequest or BatchHttpRequest): Request to execute.
+            http (httplib2.Http, optional): Connection used for the request.
+            kind (str, optional): A choice between ['read', 'write'], GET requests are reads by default.
+            idempotent (bool, optional): True if the request can be sent twice safely, inferred from its HTTP method by default.
+        Returns:
+            dict: Deserialized response.
+        """
+        kind = kind or ('read' if getattr(request, 'method', None) == 'GET' else 'write')
+        bucket = self.buckets['drive' if self.get_api(request) == 'drive' else kind]
+        tokens = self.get_cost(request)
+        if idempotent is None:
+            idempotent = self.retry_writes or self.is_idempotent(request)
+        deadline = time.time() + self.deadline if self.deadline else None
+        attempt = 0
+        while True:
+            try:
+                if bucket.acquire(deadline, tokens):
+                    self.count('throttled')
+            except SchedulerTimeout:
+                self.count('failed')
+                raise
+            self.count('calls')
+            try:
+                return request.execute(http=http)
+            except Exception as error:
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                if not self.is_retryable(error, idempotent) or attempt >= self.max_retries or (deadline is not None and time.time() + delay > deadline):
+                    self.count('failed')
+                    raise
+            self.count('retried')
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def get_api(request):
+        """This function returns the API of a request, 'drive' or 'sheets', from its uri"""
+        uri = getattr(request, 'uri', None) or getattr(request, '_batch_uri', None) or ''
+        return 'drive' if '/drive/' in uri else 'sheets'
+
+    @staticmethod
+    def get_cost(request):
+        """This function returns the number of quota tokens of a request, the number of requests of an HTTP batch"""
+        return len(getattr(request, '_order', None) or ()) or 1
+
+    @staticmethod
+    def is_idempotent(request):
+        """This function tells whether a request can be sent twice with the same result, from its HTTP method"""
+        return getattr(request, 'method', None) in IDEMPOTENT_METHODS
+
+    @staticmethod
+    def is_retryable(error, idempotent=True):
+        """This function tells whether an error is transient, quota exhaustion, server errors and dropped connections.
+        Only quota exhaustion is retryable when the request is not idempotent, it was rejected before being applied.
+        """
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+        if status is not None:
+            return int(status) == 429 or (idempotent and int(status) in RETRY_STATUSES)
+        return idempotent and isinstance(error, (socket.timeout, socket.error))
+
+
+default_scheduler = None
+default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler():
+    """This function returns the scheduler shared by every manager of the process, quotas are per user and project"""
+    global default_scheduler
+    with default_scheduler_lock:
+        if default_scheduler is None:
+            default_scheduler = RequestScheduler()
+    return default_scheduler
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from pygsheet.scheduler import get_default_scheduler
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+DISCOVERY_URLS = {
+    ('sheets', 'v4'): 'https://sheets.googleapis.com/$discovery/rest?version=v4',
+    ('drive', 'v3'): 'https://www.googleapis.com/discovery/v1/apis/drive/v3/rest',
+}
+DISCOVERY_MAX_AGE = 7 * 24 * 3600
+
+document_cache = {}
+document_cache_lock = threading.Lock()
+
+
+def get_discovery_cache_dir():
+    """This function returns the directory where discovery documents are persisted, PYGSHEET_DISCOVERY_CACHE or ~/.cache/pygsheet"""
+    return os.environ.get('PYGSHEET_DISCOVERY_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'pygsheet'))
+
+
+def load_discovery_document(api, version, cache_dir=None, max_age=DISCOVERY_MAX_AGE):
+    """This function returns a discovery document from the local cache, fetching and persisting it when it is missing or older than max_age
+    Args:
+        api (str): API name, 'sheets' or 'drive'.
+        version (str): API version.
+        cache_dir (str, optional): Cache directory, get_discovery_cache_dir() by default.
+        max_age (float, optional): Seconds after which a cached document is fetched again, a week by default.
+    Returns:
+        str: Discovery document.
+    """
+    path = os.path.join(cache_dir or get_discovery_cache_dir(), '{}.{}.json'.format(api, version))
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age:
+        with open(path) as document:
+            return document.read()
+    try:
+        import httplib2
+        response, content = httplib2.Http().request(DISCOVERY_URLS[(api, version)])
+        if response.status != 200:
+            raise IOError('Discovery document of {} {} not available: {}'.format(api, version, response.status))
+        content = content.decode('utf-8') if isinstance(content, bytes) else content
+        json.loads(content)
+    except Exception:
+        if os.path.exists(path):
+            with open(path) as document:
+                return document.read()
+        raise
+    try:
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path + '.tmp', 'w') as document:
+            document.write(content)
+        getattr(os, 'replace', os.rename)(path + '.tmp', path)
+    except (IOError, OSError):
+        pass
+    return content
+
+
+def build_service(api, version, http=None, cache_dir=None, memoize=True):
+    """This function builds a service from the local copy of its discovery document
+    The service keeps the connection, and so the credentials, it is built with, only the document is shared.
+    Args:
+        api (str): API name, 'sheets' or 'drive'.
+        version (str): API version.
+        http (httplib2.Http, optional): Default connection of the service.
+        cache_dir (str, optional): Discovery documents directory.
+        memoize (bool, optional): True if you want to reuse the discovery document already loaded in this process.
+    Returns:
+        Resource: New service object.
+    """
+    from apiclient import discovery
+    with document_cache_lock:
+        document = document_cache.get((api, version)) if memoize else None
+        if document is None:
+            document = load_discovery_document(api, version, cache_dir)
+            if memoize:
+                document_cache[(api, version)] = document
+    return discovery.build_from_document(document, http=http)
+
+
+class Session:
+    """Credentials, authorized connections and services shared by SpreadsheetManager and DriveManager.
+    Credentials are loaded and services are built once. Authorized keep-alive connections are kept in a pool,
+    every call checks one out and gives it back, so short lived worker threads reuse open connections and
+    connection setup and TLS handshakes are only paid when more calls run at once than ever before.
+    """
+    def __init__(self, app_name='PyGsheet', cred_path=None, secret_file='client_secret.json', scheduler=None, discovery_cache=None,
+                 memoize_services=True, max_idle_connections=16):
+        """Class parameters
+        Args:
+            app_name (str, optional): Just a name for the OAuth flow.
+            cred_path (str, optional): Directory of the stored credentials and client secret, ~/.credentials by default.
+            secret_file (str, optional): Client secret file name.
+            scheduler (RequestScheduler, optional): Scheduler used by the managers of this session, the process wide one by default.
+            discovery_cache (str, optional): Directory of the persisted discovery documents.
+            memoize_services (bool, optional): True if you want to share loaded discovery documents with other sessions of the process.
+            max_idle_connections (int, optional): Maximum number of open connections kept in the pool.
+        """
+        self.app_name = app_name
+        self.cred_path = cred_path
+        self.secret_file = secret_file
+        self.scheduler = scheduler or get_default_scheduler()
+        self.discovery_cache = discovery_cache
+        self.memoize_services = memoize_services
+        self.credentials = None
+        self.services = {}
+        self.max_idle_connections = max_idle_connections
+        self.connections = []
+        self.lock = threading.RLock()
+
+    def get_credentials(self):
+        """This function loads user credentials from storage, running the OAuth2 flow when they are missing or invalid
+        Returns:
+            Credentials, the obtained credential.
+        """
+        with self.lock:
+            if self.credentials is None:
+                self.credentials = self.load_credentials()
+            return self.credentials
+
+    def load_credentials(self):
+        from oauth2client import client
+        from oauth2client import tools
+        from oauth2client.file import Storage
+        if not self.cred_path:
+            home_dir = os.path.expanduser('~')
+            credential_dir = os.path.join(home_dir, '.credentials')
+            if not os.path.exists(credential_dir):
+                try:
+                    os.system("sudo mkdir {}".format(credential_dir))
+                except:
+                    os.umask(0)
+                    os.makedirs(credential_dir, mode=0o777)
+        else:
+            credential_dir = self.cred_path
+
+        credential_path = os.path.join(credential_dir, 'python-quickstart.json')
+        store = Storage(credential_path)
+        credentials = store.get()
+        if not credentials or credentials.invalid:
+            secret_path = self.secret_file
+            if self.cred_path and os.path.exists(os.path.join(self.cred_path, self.secret_file)):
+                secret_path = os.path.join(self.cred_path, self.secret_file)
+            flow = client.flow_from_clientsecrets(secret_path, scope=SCOPES)
+            flow.user_agent = self.app_name
+            try:
+                import argparse
+                flags = argparse.ArgumentParser(parents=[tools.argparser], conflict_handler='resolve').parse_known_args()[0]
+            except ImportError:
+                flags = None
+            try:
+                credentials = tools.run_flow(flow, store, flags)
+            except:  # Needed only for compatibility with Python 2.6
+                try:
+                    credentials = tools.run_flow(flow, store)
+                except:
+                    credentials = tools.run(flow, store)
+            print('Storing credentials to ' + credential_path)
+        return credentials
+
+    def new_http(self):
+        """This function opens a new authorized connection
+        Returns:
+            httplib2.Http: Connection authorized with the session credentials.
+        """
+        import httplib2
+        http = httplib2.Http()
+        if hasattr(http, 'redirect_codes'):
+            # 308 is the resumable upload "resume incomplete" status, not a redirect
+            http.redirect_codes = http.redirect_codes - {308}
+        return self.get_credentials().authorize(http)
+
+    @contextmanager
+    def connection(self):
+        """This function checks out an authorized keep-alive connection of the pool, opening one when every
+        connection is in use, and gives it back when the with block ends. httplib2.Http is not thread safe,
+        a connection is only used by one call at a time.
+        Yields:
+            httplib2.Http: Connection for executing requests.
+        """
+        with self.lock:
+            http = self.connections.pop() if self.connections else None
+        if http is None:
+            http = self.new_http()
+        try:
+            yield http
+        finally:
+            with self.lock:
+                if len(self.connections) < self.max_idle_connections:
+                    self.connections.append(http)
+
+    def get_service(self, api, version):
+        """This function returns a service of this session, building it on first use
+        Args:
+            api (str): API name, 'sheets' or 'drive'.
+            version (str): API version.
+        Returns:
+            Resource: Service object of this session, its default connection is only used by requests executed without
+                an explicit http, the managers execute them with a connection of the pool.
+        """
+        with self.lock:
+            if (api, version) not in self.services:
+                self.services[(api, version)] = build_service(api, version, http=self.new_http(),
+                    cache_dir=self.discovery_cache, memoize=self.memoize_services)
+            return self.services[(api, version)]
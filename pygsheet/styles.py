@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from pygsheet.ranges import GridRange
+
+UNBOUNDED = 2 ** 62
+
+
+class StyleRegistry:
+    """Thread safe table of interned formats, equal formats are replaced by the first instance registered
+    Formats are immutable and looked up by their cached key. Entries are never evicted, a registry shared
+    by several planners grows with every distinct format they plan.
+    """
+    def __init__(self):
+        self.styles = {}
+        self.lock = threading.Lock()
+
+    def intern(self, style):
+        """This function returns the registered format equal to style, registering style when there is none"""
+        with self.lock:
+            return self.styles.setdefault(style.key(), style)
+
+    def __len__(self):
+        return len(self.styles)
+
+
+def bounds(grid_range):
+    """This function returns the (start_row, end_row, start_col, end_col) bounds of a GridRange, unbounded sides as 0 or UNBOUNDED"""
+    return (grid_range.start_row or 0, UNBOUNDED if grid_range.end_row is None else grid_range.end_row,
+            grid_range.start_col or 0, UNBOUNDED if grid_range.end_col is None else grid_range.end_col)
+
+
+def intersects(a, b):
+    """This function returns True if two (start_row, end_row, start_col, end_col) bounds share a cell"""
+    return a[0] < b[1] and b[0] < a[1] and a[2] < b[3] and b[2] < a[3]
+
+
+class RangeSet:
+    """Ranges of a planned format with an index of rows, overlap checks only look at ranges near the query
+    Ranges are bucketed by blocks of BUCKET_ROWS rows, ranges which span many blocks are kept apart and always checked.
+    """
+    BUCKET_ROWS = 16
+    MAX_BUCKETS = 64
+
+    def __init__(self):
+        self.ranges = []
+        self.buckets = {}
+        self.wide = []
+
+    def blocks(self, rectangle):
+        first, last = rectangle[0] // self.BUCKET_ROWS, (rectangle[1] - 1) // self.BUCKET_ROWS
+        return range(first, last + 1) if last - first < self.MAX_BUCKETS else None
+
+    def add(self, grid_range):
+        self.ranges.append(grid_range)
+        rectangle = bounds(grid_range)
+        blocks = self.blocks(rectangle)
+        if blocks is None:
+            self.wide.append(rectangle)
+        else:
+            for block in blocks:
+                self.buckets.setdefault(block, []).append(rectangle)
+
+    def intersects(self, grid_range):
+        """This function returns True if the range shares a cell with any range of the set"""
+        rectangle = bounds(grid_range)
+        blocks = self.blocks(rectangle)
+        if blocks is None:
+            candidates = [bounds(other) for other in self.ranges]
+        else:
+            candidates = self.wide + [other for block in blocks for other in self.buckets.get(block, ())]
+        return any(intersects(rectangle, other) for other in candidates)
+
+
+def merge_rectangles(ranges):
+    """This function covers the union of several ranges with few rectangles, adjacent and overlapping ranges are merged
+    Rows are cut in bands where no range starts or ends, the covered columns of each band are merged in runs
+    and runs repeated in consecutive bands are joined in a single rectangle.
+    Args:
+        ranges (list): GridRange objects of the same sheet.
+    Returns:
+        list: GridRange objects which do not overlap, sorted by position.
+    """
+    rectangles = [bounds(grid_range) for grid_range in ranges]
+    rectangles = [rectangle for rectangle in rectangles if rectangle[0] < rectangle[1] and rectangle[2] < rectangle[3]]
+    edges = sorted(set([rectangle[0] for rectangle in rectangles] + [rectangle[1] for rectangle in rectangles]))
+    pending = sorted(rectangles, reverse=True)
+    active = []
+    merged = []
+    open_runs = {}
+    last_end = None
+    for start, end in zip(edges, edges[1:]):
+        while pending and pending[-1][0] <= start:
+            active.append(pending.pop())
+        active = [rectangle for rectangle in active if rectangle[1] > start]
+        columns = sorted((rectangle[2], rectangle[3]) for rectangle in active)
+        runs = []
+        for first, last in columns:
+            if runs and first <= runs[-1][1]:
+                runs[-1][1] = max(runs[-1][1], last)
+            else:
+                runs.append([first, last])
+        current = {}
+        for first, last in runs:
+            current[(first, last)] = open_runs.pop((first, last), start) if last_end == start else start
+        for (first, last), first_row in open_runs.items():
+            merged.append((first_row, last_end, first, last))
+        open_runs = current
+        last_end = end
+    for (first, last), first_row in open_runs.items():
+        merged.append((first_row, last_end, first, last))
+    return [GridRange(None, start_row or None, None if end_row == UNBOUNDED else end_row,
+                      start_col or None, None if end_col == UNBOUNDED else end_col)
+            for start_row, end_row, start_col, end_col in sorted(merged)]
+
+
+class FormatPlanner:
+    """Collects formats for ranges and sends the fewest requests which apply them.
+    Equal formats are interned and grouped, the ranges of each group are merged in rectangles and every
+    rectangle gets a single repeatCell or updateBorders request. A range only joins an earlier group of its
+    format when it does not overlap ranges formatted after that group, so the result is the same as applying
+    every format in order.
+    """
+    def __init__(self, manager, style_registry=None):
+        """Class parameters
+        Args:
+            manager (SpreadsheetManager): Manager of the spreadsheet, requests follow its pipeline mode.
+            style_registry (StyleRegistry, optional): Registry of interned formats shared with other planners, by default
+                the planner has its own one, emptied with the plan.
+        """
+        self.manager = manager
+        self.shared_registry = style_registry is not None
+        self.registry = StyleRegistry() if style_registry is None else style_registry
+        self.groups = []
+
+    def add(self, sheet, sheet_range, style):
+        """This function plans a format for a range
+        Args:
+            sheet (str): Sheet name.
+            sheet_range (:obj: `tuple` of :obj:`tuple` of :obj: `int`): A tuple with two coordinates which delimitate a sheet range, all sheet if None.
+            sheet_range (str): Another implementation of sheet range which suports excel range format.
+            style (Format): TextFormat, CellFormat or BorderFormat to apply.
+        """
+        style = self.registry.intern(style)
+        grid_range = GridRange.parse(sheet_range) if sheet_range else GridRange()
+        target = None
+        for index in range(len(self.groups) - 1, -1, -1):
+            group_sheet, group_style, ranges = self.groups[index]
+            if group_sheet == sheet and group_style is style:
+                target = ranges
+                break
+            if group_sheet == sheet and ranges.intersects(grid_range):
+                break
+        if target is None:
+            target = RangeSet()
+            self.groups.append((sheet, style, target))
+        target.add(grid_range)
+
+    def cell_format(self, sheet, sheet_range=None, **kwargs):
+        """This function plans a CellFormat built from the arguments of SpreadsheetManager.cell_format"""
+        from pygsheet.pygsheet import CellFormat
+        self.add(sheet, sheet_range, CellFormat(**kwargs))
+
+    def text_format(self, sheet, sheet_range=None, **kwargs):
+        """This function plans a TextFormat built from the arguments of SpreadsheetManager.text_format"""
+        from pygsheet.pygsheet import TextFormat
+        self.add(sheet, sheet_range, TextFormat(**kwargs))
+
+    def update_borders(self, sheet, style, width, sheet_range=None, **kwargs):
+        """This function plans a BorderFormat built from the arguments of SpreadsheetManager.update_borders"""
+        from pygsheet.pygsheet import BorderFormat
+        self.add(sheet, sheet_range, BorderFormat(style, width, **kwargs))
+
+    def get_requests(self):
+        """This function builds the requests of the planned formats, in order
+        Returns:
+            list: repeatCell and updateBorders requests.
+        """
+        requests = []
+        for sheet, style, ranges in self.groups:
+            sheet_id = self.manager.get_sheets_id(sheet)
+            if style.mergeable:
+                rectangles = merge_rectangles(ranges.ranges)
+            else:
+                rectangles = list(dict.fromkeys(ranges.ranges))
+            requests.extend(style.get_request(rectangle.to_dict(sheet_id)) for rectangle in rectangles)
+        return requests
+
+    def execute(self):
+        """This function sends the planned formats, in as few batchUpdate calls as the batch limits allow, and clears the plan
+        Returns:
+            int: Number of requests.
+        """
+        manager = self.manager
+        operations = [("batchUpdate", request) for request in self.get_requests()]
+        self.groups = []
+        if not self.shared_registry:
+            self.registry = StyleRegistry()
+        if manager.with_pipeline:
+            manager.pipeline.extend(operations)
+        else:
+            for kind, value_input, batch in manager.split_pipeline(operations):
+                manager.execute_batch(kind, value_input, batch)
+        return len(operations)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
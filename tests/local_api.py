@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Sessions whose services talk to an HTTP server on localhost instead of Google."""
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+from pygsheet.scheduler import RequestScheduler
+from pygsheet.session import Session
+
+
+class Credentials:
+    def authorize(self, http):
+        return http
+
+
+def local_session(root_url, cache_dir, **scheduler_options):
+    """This function returns a session whose services send every request to root_url
+    The discovery documents bundled with google-api-python-client are copied to cache_dir with their rootUrl replaced.
+    """
+    import googleapiclient
+    for name in ('sheets.v4.json', 'drive.v3.json'):
+        with open(os.path.join(os.path.dirname(googleapiclient.__file__), 'discovery_cache', 'documents', name)) as document:
+            discovery = json.load(document)
+        discovery['rootUrl'] = root_url
+        with open(os.path.join(cache_dir, name), 'w') as document:
+            json.dump(discovery, document)
+    options = dict(reads_per_minute=6000, writes_per_minute=6000, backoff=0.01)
+    options.update(scheduler_options)
+    session = Session('test', scheduler=RequestScheduler(**options), discovery_cache=cache_dir, memoize_services=False)
+    session.credentials = Credentials()
+    return session
+
+
+def start_server(handler):
+    """This function serves handler on a free localhost port from a daemon thread
+    Returns:
+        tuple: (server, root_url)
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, 'http://127.0.0.1:{}/'.format(server.server_address[1])
+
+
+def send_json(handler, status, data=None, headers=None):
+    body = json.dumps(data).encode() if data is not None else b''
+    handler.send_response(status)
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    if data is not None:
+        handler.send_header('Content-Type', 'application/json')
+    handler.send_header('Content-Length', str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
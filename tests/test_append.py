@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""SpreadsheetManager appends against a local stand-in of the Sheets values API, which records the rows of every request."""
+import json
+import shutil
+import tempfile
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from pygsheet.grid import CompactGrid
+from pygsheet.pygsheet import SpreadsheetManager
+from tests.local_api import local_session, send_json, start_server
+
+
+class AppendHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        values = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))['values']
+        with self.server.lock:
+            self.server.chunks.append(values)
+        send_json(self, 200, {'updates': {'updatedRange': 'Sheet1!A1:B{}'.format(len(values)), 'updatedRows': len(values)}})
+
+
+class AppendTest(unittest.TestCase):
+    def setUp(self):
+        self.server, root_url = start_server(AppendHandler)
+        self.server.chunks = []
+        self.cache_dir = tempfile.mkdtemp()
+        self.manager = SpreadsheetManager('test', spreadsheetId='spreadsheet', session=local_session(root_url, self.cache_dir), lazy=True)
+        self.rows = [[i, 'row{}'.format(i)] for i in range(2500)]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def test_list_is_sent_in_one_request(self):
+        summary = self.manager.append_data(self.rows, 'Sheet1')
+        self.assertEqual(summary['chunks'], 1)
+        self.assertEqual(self.server.chunks, [self.rows])
+
+    def test_grid_is_sent_in_one_request(self):
+        summary = self.manager.append_data(CompactGrid.from_rows(self.rows), 'Sheet1')
+        self.assertEqual(summary['chunks'], 1)
+        self.assertEqual(len(self.server.chunks[0]), len(self.rows))
+
+    def test_generator_is_chunked(self):
+        summary = self.manager.append_data((row for row in self.rows), 'Sheet1')
+        self.assertEqual(summary, {'rows': 2500, 'chunks': 3, 'ranges': ['Sheet1!A1:B1000', 'Sheet1!A1:B1000', 'Sheet1!A1:B500']})
+        self.assertEqual([row for chunk in self.server.chunks for row in chunk], self.rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""AsyncSpreadsheetManager against a local stand-in of the Sheets API.
+
+The service is built from the discovery document bundled with google-api-python-client, pointed at an
+HTTP server on localhost which answers every values read after a fixed delay.
+"""
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+from pygsheet.async_manager import AsyncDriveManager, AsyncSpreadsheetManager
+from pygsheet.drive_manager import DriveManager
+from pygsheet.pygsheet import SpreadsheetManager
+from tests.local_api import local_session, send_json, start_server
+
+DELAY = 0.5
+
+
+class SheetsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        if url.path.endswith('/files'):
+            server.queries.append(parse_qs(url.query))
+            send_json(self, 200, {'files': [{'id': 'file'}]})
+            return
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(DELAY)
+        with server.lock:
+            server.active -= 1
+            server.requests += 1
+        send_json(self, 200, {'range': 'Sheet1!A1:B1', 'values': [[1, 'a']]})
+
+
+class AsyncSpreadsheetManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.server, root_url = start_server(SheetsHandler)
+        self.server.active = self.server.max_active = self.server.requests = 0
+        self.server.queries = []
+        self.cache_dir = tempfile.mkdtemp()
+        self.session = local_session(root_url, self.cache_dir)
+        self.manager = SpreadsheetManager('test', spreadsheetId='spreadsheet', session=self.session, lazy=True)
+        self.manager.service
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def test_gathered_reads_run_concurrently(self):
+        async def read_all():
+            async with AsyncSpreadsheetManager(manager=self.manager, concurrency=10) as manager:
+                return await asyncio.gather(*[manager.read_data_in_range('Sheet1', 'A1:B1') for _ in range(20)])
+
+        start = time.time()
+        results = asyncio.run(read_all())
+        elapsed = time.time() - start
+        self.assertEqual(results, [[[1, 'a']]] * 20)
+        self.assertEqual(self.server.requests, 20)
+        self.assertEqual(self.server.max_active, 10)
+        self.assertLess(elapsed, 20 * DELAY / 2)
+
+    def test_connections_are_pooled(self):
+        async def read_twice():
+            async with AsyncSpreadsheetManager(manager=self.manager, concurrency=4) as manager:
+                for _ in range(2):
+                    await asyncio.gather(*[manager.read_data_in_range('Sheet1', 'A1:B1') for _ in range(4)])
+
+        asyncio.run(read_twice())
+        self.assertEqual(len(self.session.connections), 4)
+
+    def test_manager_is_built_lazily(self):
+        async def read():
+            async with AsyncSpreadsheetManager('test', spreadsheetId='spreadsheet', session=self.session) as manager:
+                self.assertIsNone(manager.manager._service)
+                self.assertEqual(self.server.requests, 0)
+                return await manager.read_data_in_range('Sheet1', 'A1:B1')
+
+        self.assertEqual(asyncio.run(read()), [[1, 'a']])
+
+    def test_list_files_query(self):
+        async def list_files():
+            async with AsyncDriveManager(manager=DriveManager(session=self.session)) as manager:
+                return await manager.list_files(q="name = 'data'")
+
+        self.assertEqual(asyncio.run(list_files()), ['file'])
+        self.assertEqual(self.server.queries[0]['q'], ["name = 'data'"])
+
+
+if __name__ == '__main__':
+    unittest.main()
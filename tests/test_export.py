@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from pygsheet.export import export_file_names, export_rows
+
+
+def failing_rows():
+    yield ['name', 'value']
+    yield ['a', 1]
+    raise IOError('connection dropped')
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_colliding_names_get_the_sheet_index(self):
+        self.assertEqual(export_file_names(['a/b', 'Data', 'a_b', 'data', 'c'], 'csv'),
+                         ['a_b_0.csv', 'Data_1.csv', 'a_b_2.csv', 'data_3.csv', 'c.csv'])
+
+    def test_partial_files_are_removed(self):
+        formats = ['csv']
+        try:
+            import pyarrow
+            formats += ['parquet', 'arrow']
+        except ImportError:
+            pass
+        for fmt in formats:
+            path = os.path.join(self.directory, 'sheet.' + fmt)
+            with self.assertRaises(IOError):
+                export_rows(failing_rows(), path, fmt, batch_rows=1)
+            self.assertFalse(os.path.exists(path), fmt)
+
+    def test_csv(self):
+        path = os.path.join(self.directory, 'sheet.csv')
+        self.assertEqual(export_rows([['name', 'value'], ['a', 1]], path), 2)
+        with open(path, newline='') as data:
+            self.assertEqual(data.read(), 'name,value\r\na,1\r\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+import numpy
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from pygsheet.frames import encode_rows, rows_to_columns
+
+
+class RowsToColumnsTest(unittest.TestCase):
+    def test_ragged_rows_are_padded_and_typed(self):
+        names, columns = rows_to_columns([['n', 'x', 'flag', 'code'], [1, 1.5, True, '007'], [2, '', False], [3]])
+        self.assertEqual(names, ['n', 'x', 'flag', 'code'])
+        self.assertEqual(columns[0].dtype, numpy.int64)
+        self.assertEqual(columns[1].dtype, numpy.float64)
+        self.assertTrue(numpy.isnan(columns[1][1:]).all())
+        self.assertEqual(columns[2].tolist(), [True, False, None])
+        self.assertEqual(columns[3].tolist(), ['007', None, None])
+
+    def test_integer_dtype_rejects_empty_cells(self):
+        with self.assertRaises(ValueError):
+            rows_to_columns([['n'], [1], []], dtypes='int64')
+
+
+@unittest.skipIf(pandas is None, 'pandas is not installed')
+class EncodeRowsTest(unittest.TestCase):
+    def encode(self, frame):
+        rows = list(encode_rows(frame, header=False))
+        # the API rejects the NaN token, the payload must be strict JSON
+        json.dumps(rows, allow_nan=False)
+        return rows
+
+    def test_nullable_columns(self):
+        frame = pandas.DataFrame({
+            'flag': pandas.array([True, None], dtype='boolean'),
+            'count': pandas.array([1, None], dtype='Int64'),
+            'text': pandas.array(['a', None], dtype='string'),
+            'mixed': pandas.Series(['a', pandas.NA], dtype=object),
+        })
+        self.assertEqual(self.encode(frame), [[True, 1, 'a', 'a'], ['', '', '', '']])
+
+    def test_timezone_aware_datetimes(self):
+        frame = pandas.DataFrame({'when': pandas.to_datetime(['2020-01-01 12:00', None]).tz_localize('Europe/Madrid')})
+        self.assertEqual(self.encode(frame), [[43831.5], ['']])
+
+    def test_naive_datetimes_and_floats(self):
+        frame = pandas.DataFrame({'when': pandas.to_datetime(['2020-01-01', None]), 'value': [1.5, float('nan')]})
+        self.assertEqual(self.encode(frame), [[43831.0, 1.5], ['', '']])
+
+
+if __name__ == '__main__':
+    unittest.main()
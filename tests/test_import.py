@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""SpreadsheetManager.convert_file against a local stand-in of the Drive and Sheets APIs.
+
+The server accepts single request resumable uploads, answers the calls of the conversion with a
+converted sheet of 1000 rows and counts every request it receives.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from pygsheet.pygsheet import SpreadsheetManager
+from tests.local_api import local_session, send_json, start_server
+
+
+class ConvertHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def handle_one_request(self):
+        BaseHTTPRequestHandler.handle_one_request(self)
+        if getattr(self, 'command', None):
+            with self.server.lock:
+                self.server.requests.append((self.command, self.path.split('?')[0]))
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_POST(self):
+        self.read_body()
+        path = self.path.split('?')[0]
+        if path.startswith('/upload/'):
+            send_json(self, 200, headers={'Location': 'http://127.0.0.1:{}/resumable/1'.format(self.server.server_address[1])})
+        elif path.endswith(':copyTo'):
+            send_json(self, 200, {'sheetId': 7, 'title': 'Copy of Sheet1'})
+        else:
+            send_json(self, 200, {'spreadsheetId': 'spreadsheet', 'replies': [{}]})
+
+    def do_PUT(self):
+        self.read_body()
+        send_json(self, 200, {'id': 'converted'})
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path.endswith('/converted'):
+            send_json(self, 200, {'sheets': [{'properties': {'sheetId': 0, 'gridProperties': {'rowCount': 1000, 'columnCount': 26}}}]})
+        else:
+            send_json(self, 200, {'sheets': [{'properties': {'sheetId': 7, 'title': 'Imported'}}]})
+
+    def do_DELETE(self):
+        send_json(self, 204)
+
+
+class ConvertFileTest(unittest.TestCase):
+    def setUp(self):
+        self.server, root_url = start_server(ConvertHandler)
+        self.server.requests = []
+        self.directory = tempfile.mkdtemp()
+        self.manager = SpreadsheetManager('test', spreadsheetId='spreadsheet', session=local_session(root_url, self.directory), lazy=True)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def convert(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as data:
+            data.write(content)
+        return self.manager.convert_file(path, 'Imported')
+
+    def test_text_file_reports_records(self):
+        summary = self.convert('data.csv', b'name,note\na,"line\nbreak"\nb,\n')
+        self.assertEqual(summary['rows'], 3)
+        self.assertEqual(summary['requests'], len(self.server.requests))
+        self.assertFalse(any('/values/' in path for method, path in self.server.requests))
+
+    def test_spreadsheet_file_reports_grid_rows(self):
+        summary = self.convert('data.xlsx', b'PK\x03\x04')
+        self.assertEqual(summary['rows'], 1000)
+        self.assertEqual(summary['requests'], len(self.server.requests))
+        self.assertFalse(any('/values/' in path for method, path in self.server.requests))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""MultiSpreadsheetReader against a local stand-in of the Sheets API, which answers every batchGet after a delay."""
+import shutil
+import tempfile
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from pygsheet.multi_reader import MultiSpreadsheetReader
+from pygsheet.pygsheet import SpreadsheetManager
+from tests.local_api import local_session, send_json, start_server
+
+DELAY = 0.2
+
+
+class BatchGetHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        spreadsheet_id = self.path.split('/')[3]
+        with self.server.lock:
+            self.server.requests.append(spreadsheet_id)
+        time.sleep(DELAY)
+        send_json(self, 200, {'spreadsheetId': spreadsheet_id, 'valueRanges': [{'range': 'Sheet1!A1', 'values': [[spreadsheet_id]]}]})
+
+
+class MultiSpreadsheetReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.server, root_url = start_server(BatchGetHandler)
+        self.server.requests = []
+        self.cache_dir = tempfile.mkdtemp()
+        manager = SpreadsheetManager('test', spreadsheetId='spreadsheet', session=local_session(root_url, self.cache_dir), lazy=True)
+        self.reader = MultiSpreadsheetReader(manager, max_workers=2)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def test_read(self):
+        ids = ['s{}'.format(i) for i in range(4)]
+        results = {spreadsheet_id: (data, error) for spreadsheet_id, data, error in self.reader.read(ids, [('Sheet1', 'A1')])}
+        self.assertEqual(results, {spreadsheet_id: ({('Sheet1', 'A1'): [spreadsheet_id]}, None) for spreadsheet_id in ids})
+
+    def test_empty_ranges_send_nothing(self):
+        self.assertEqual(self.reader.read_spreadsheet('s0', []), {})
+        self.assertEqual(self.server.requests, [])
+
+    def test_stopping_early_cancels_pending_reads(self):
+        reads = self.reader.read(['s{}'.format(i) for i in range(20)], ['Sheet1'])
+        next(reads)
+        reads.close()
+        time.sleep(DELAY * 3)
+        self.assertLessEqual(len(self.server.requests), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
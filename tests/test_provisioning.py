@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import socket
+import unittest
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from pygsheet.provisioning import TemplateProvisioner
+from pygsheet.scheduler import RequestScheduler
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({'status': status}), b'{}')
+
+
+class Drive:
+    """Stand-in of DriveManager which raises the queued errors of each call before succeeding"""
+    def __init__(self, copy_errors=(), share_errors=()):
+        self.scheduler = RequestScheduler()
+        self.errors = {'copy': list(copy_errors), 'share': list(share_errors)}
+        self.calls = {'copy': 0, 'share': 0}
+
+    def call(self, name):
+        self.calls[name] += 1
+        if self.errors[name]:
+            raise self.errors[name].pop(0)
+
+    def copy_file(self, file_id, new_name=None, new_folder=None):
+        self.call('copy')
+        return {'id': 'copy-of-' + new_name}
+
+    def share_many(self, file_ids, domain=None, user_list=None):
+        self.call('share')
+        return [{'error': None}]
+
+
+class RunStageTest(unittest.TestCase):
+    def provision(self, drive):
+        provisioner = TemplateProvisioner(drive, 'template', domain='example.com', retries=3, backoff=0.001)
+        return provisioner.provision(['report'])[0]
+
+    def test_timed_out_copy_is_not_repeated(self):
+        drive = Drive(copy_errors=[socket.timeout()])
+        entry = self.provision(drive)
+        self.assertEqual(drive.calls['copy'], 1)
+        self.assertEqual(entry['stages']['copy']['status'], 'failed')
+        self.assertEqual(entry['stages']['share']['status'], 'skipped')
+
+    def test_copy_is_retried_on_quota_errors(self):
+        drive = Drive(copy_errors=[http_error(429)])
+        entry = self.provision(drive)
+        self.assertEqual(entry['spreadsheet_id'], 'copy-of-report')
+        self.assertEqual(entry['stages']['copy']['attempts'], 2)
+
+    def test_transient_share_errors_are_retried(self):
+        drive = Drive(share_errors=[http_error(503), socket.timeout()])
+        entry = self.provision(drive)
+        self.assertEqual(entry['stages']['share']['status'], 'done')
+        self.assertEqual(drive.calls['share'], 3)
+
+    def test_client_errors_are_not_retried(self):
+        drive = Drive(share_errors=[http_error(404)])
+        entry = self.provision(drive)
+        self.assertEqual(entry['stages']['share']['status'], 'failed')
+        self.assertEqual(drive.calls['share'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from pygsheet.ranges import GridRange
+
+
+class GridRangeParseTest(unittest.TestCase):
+    def test_a1_ranges(self):
+        self.assertEqual(GridRange.parse('A1:B2'), GridRange(None, 0, 2, 0, 2))
+        self.assertEqual(GridRange.parse('B2:B'), GridRange(None, 1, None, 1, 2))
+        self.assertEqual(GridRange.parse('1:3'), GridRange(None, 0, 3, None, None))
+        self.assertEqual(GridRange.parse("'a!b'!C3:D").sheet, 'a!b')
+
+    def test_round_trip(self):
+        for sheet_range in ['A1', 'A1:B2', 'A:B', '1:3', 'C3:D']:
+            self.assertEqual(GridRange.parse(sheet_range).to_a1(), sheet_range)
+
+    def test_empty_bounds_are_rejected(self):
+        for sheet_range in ['A1:', ':B2', 'Sheet1!A1:', 'A1:B2:C3']:
+            with self.assertRaises(ValueError):
+                GridRange.parse(sheet_range)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from pygsheet.pygsheet import CellFormat
+from pygsheet.styles import FormatPlanner, StyleRegistry
+
+
+class Manager:
+    with_pipeline = True
+
+    def __init__(self):
+        self.pipeline = []
+
+    def get_sheets_id(self, sheet):
+        return 0
+
+
+class FormatPlannerTest(unittest.TestCase):
+    def plan_gradient(self, planner, n_rows):
+        for i in range(n_rows):
+            planner.cell_format('Sheet1', ((i + 1, 1), (i + 1, 1)), background=(i % 100, 1, 1))
+
+    def test_planners_do_not_share_formats_by_default(self):
+        first, second = FormatPlanner(Manager()), FormatPlanner(Manager())
+        self.plan_gradient(first, 10)
+        self.assertEqual(len(first.registry), 10)
+        self.assertEqual(len(second.registry), 0)
+
+    def test_own_registry_is_emptied_with_the_plan(self):
+        manager = Manager()
+        planner = FormatPlanner(manager)
+        self.plan_gradient(planner, 150)
+        self.assertEqual(len(planner.registry), 100)
+        self.assertEqual(planner.execute(), 150)
+        self.assertEqual(len(manager.pipeline), 150)
+        self.assertEqual(len(planner.registry), 0)
+
+    def test_shared_registry_is_kept(self):
+        registry = StyleRegistry()
+        planner = FormatPlanner(Manager(), registry)
+        planner.cell_format('Sheet1', ((1, 1), (2, 2)), background=(255, 255, 255))
+        planner.execute()
+        self.assertIs(planner.registry, registry)
+        self.assertEqual(len(registry), 1)
+
+    def test_equal_formats_are_merged(self):
+        planner = FormatPlanner(Manager())
+        for i in range(1, 11):
+            planner.add('Sheet1', ((i, 1), (i, 3)), CellFormat(background=(255, 255, 255)))
+        self.assertEqual(len(planner.get_requests()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Resumable uploads of DriveManager against a local stand-in of the Drive upload endpoint.
+
+The endpoint follows the resumable protocol: the POST opens an upload session, every PUT carries a
+Content-Range and is answered with 308 and the acknowledged Range until the last byte arrives.
+Every third chunk is rejected with 503 without storing it.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from pygsheet.drive_manager import DriveManager
+from tests.local_api import local_session, send_json, start_server
+
+CHUNK_SIZE = 256 * 1024
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def read_body(self):
+        with self.server.lock:
+            self.server.requests += 1
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_POST(self):
+        metadata = json.loads(self.read_body() or b'{}')
+        with self.server.lock:
+            upload_id = str(len(self.server.uploads))
+            self.server.uploads[upload_id] = {'metadata': metadata, 'data': b''}
+        location = 'http://127.0.0.1:{}/resumable/{}'.format(self.server.server_address[1], upload_id)
+        send_json(self, 200, headers={'Location': location})
+
+    def do_PUT(self):
+        upload = self.server.uploads[self.path.split('/')[-1]]
+        body = self.read_body()
+        content_range = self.headers.get('Content-Range', '')
+        if not content_range.startswith('bytes */'):
+            with self.server.lock:
+                self.server.chunks += 1
+                failed = self.server.fail_every and self.server.chunks % self.server.fail_every == 0
+            if failed:
+                send_json(self, 503, {'error': {'code': 503, 'message': 'Backend Error'}})
+                return
+            start = int(content_range.split(' ')[1].split('-')[0])
+            if start != len(upload['data']):
+                send_json(self, 400, {'error': {'code': 400, 'message': 'Unexpected offset'}})
+                return
+            upload['data'] += body
+        total = content_range.split('/')[-1]
+        if total != '*' and len(upload['data']) == int(total):
+            send_json(self, 200, {'id': 'file' + self.path.split('/')[-1]})
+        elif upload['data']:
+            send_json(self, 308, headers={'Range': 'bytes=0-{}'.format(len(upload['data']) - 1)})
+        else:
+            send_json(self, 308)
+
+
+class ResumableUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.server, root_url = start_server(UploadHandler)
+        self.server.uploads = {}
+        self.server.chunks = self.server.requests = 0
+        self.server.fail_every = 3
+        self.directory = tempfile.mkdtemp()
+        self.manager = DriveManager(session=local_session(root_url, self.directory))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def make_file(self, name, size):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as data:
+            data.write(os.urandom(size))
+        return path
+
+    def uploaded(self, response):
+        return self.server.uploads[response['id'][len('file'):]]['data']
+
+    def test_failed_chunks_are_retried(self):
+        path = self.make_file('data.bin', CHUNK_SIZE * 5 + 123)
+        progress = []
+        response = self.manager.upload_file(path, chunk_size=CHUNK_SIZE, progress=lambda *args: progress.append(args))
+        with open(path, 'rb') as data:
+            self.assertEqual(self.uploaded(response), data.read())
+        self.assertGreater(self.manager.scheduler.stats['retried'], 0)
+        self.assertEqual(response['requests'], self.server.requests)
+        self.assertEqual(progress[-1], (path, os.path.getsize(path), os.path.getsize(path)))
+
+    def test_failed_upload_resumes(self):
+        self.manager.scheduler.max_retries = 0
+        path = self.make_file('data.bin', CHUNK_SIZE * 5)
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                response = self.manager.upload_file(path, chunk_size=CHUNK_SIZE)
+                break
+            except Exception:
+                self.assertLess(attempts, 10)
+        self.assertGreater(attempts, 1)
+        self.assertEqual(len(self.server.uploads), 1)
+        with open(path, 'rb') as data:
+            self.assertEqual(self.uploaded(response), data.read())
+        self.assertEqual(self.manager.uploads, {})
+
+    def test_upload_many(self):
+        paths = [self.make_file('data{}.bin'.format(i), CHUNK_SIZE * (i + 1) + i) for i in range(4)]
+        results = self.manager.upload_many(paths + [os.path.join(self.directory, 'missing.bin')], max_workers=3, chunk_size=CHUNK_SIZE)
+        for path, result in zip(paths, results):
+            self.assertIsNone(result['error'])
+            with open(path, 'rb') as data:
+                self.assertEqual(self.uploaded(result['response']), data.read())
+        self.assertIsInstance(results[-1]['error'], (IOError, OSError))
+
+
+if __name__ == '__main__':
+    unittest.main()